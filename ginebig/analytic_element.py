@@ -7,6 +7,7 @@ Copyright (c) 2017, Randal J. Barnes
 """
 
 import abc
+import copy
 
 __version__ = '07 June 2017'
 
@@ -32,6 +33,8 @@ class AnalyticElement(abc.ABC):
         def activate(self)
         def deactivate(self)
         def isactive(self)
+        def translated(self, dz)
+        def translation_constant(self, dz)
 
     Required abstract methods:
         def complex_potential(self, z)
@@ -42,6 +45,8 @@ class AnalyticElement(abc.ABC):
         def solve(self, geo, root)
     """
 
+    active = True
+
     # --------------------------------------------------------------------------
     def activate(self):
         self.active = True
@@ -54,6 +59,49 @@ class AnalyticElement(abc.ABC):
     def isactive(self):
         return self.active
 
+    # --------------------------------------------------------------------------
+    def translated(self, dz: complex):
+        """
+        Return a copy of the element translated by <dz>.
+
+        The default implementation shifts the element's location attribute
+        <z>, if it has one. Elements located by other attributes must
+        override this method.
+
+        Arguments:
+            dz (complex): translation [L].
+
+        Returns:
+            AnalyticElement: the translated copy.
+
+        """
+        other = copy.copy(self)
+        if hasattr(other, 'z'):
+            other.z = self.z + dz
+        return other
+
+    # --------------------------------------------------------------------------
+    def translation_constant(self, dz: complex) -> complex:
+        """
+        Constant restoring the complex potential after a translation.
+
+        Return the constant c such that
+
+            Omega(z) = translated(dz).complex_potential(z + dz) + c
+
+        for every location z. The default is 0, which holds for any element
+        whose complex potential depends only on the position relative to the
+        element.
+
+        Arguments:
+            dz (complex): translation [L].
+
+        Returns:
+            complex: the constant [L^3/T].
+
+        """
+        return complex(0, 0)
+
     # --------------------------------------------------------------------------
     @abc.abstractmethod
     def complex_potential(self, z: complex) -> complex:
@@ -0,0 +1,189 @@
+"""<circular_recharge.py> implements the CircularRecharge class.
+
+This file is part of the Ginebig Project and is distributed under the
+BSD-3-Clause license. See the accompanying LICENSE.txt file.
+
+Copyright (c) 2017, Randal J. Barnes
+"""
+
+import math
+import numpy
+
+from ginebig.analytic_element import AnalyticElement
+
+__version__ = '07 June 2017'
+
+
+# ------------------------------------------------------------------------------
+class Error(Exception):
+    """Base class for all exceptions raised by this module."""
+
+
+class InvalidRadiusError(Error):
+    """The specified recharge radius was not strictly positive."""
+
+
+# ------------------------------------------------------------------------------
+class CircularRecharge(AnalyticElement):
+    """Uniform areal recharge over a circular region.
+
+    The recharge rate N [L/T] is the volume of water added to the aquifer per
+    unit area per unit time; a negative N represents an areal sink (e.g.
+    evapotranspiration).
+
+    All of the evaluation methods accept either a single complex location or
+    a numpy array of complex locations, and return a result of the same shape.
+    The precision of a complex64 array of locations is preserved.
+    """
+
+    # --------------------------------------------------------------------------
+    def __init__(self, z: complex, N: float, R: float):
+        """
+        Intialize the attributes with minimal validation.
+
+        Arguments:
+           z (complex): center of the recharge circle [L].
+           N (float): recharge rate [L/T].
+           R (float): radius of the recharge circle [L].
+
+        Raises:
+            circular_recharge.Error: Base class for all exceptions raised by
+                this module.
+            circular_recharge.InvalidRadiusError: The specified recharge
+                radius was not strictly positive.
+        """
+        if R < numpy.finfo(float).eps:
+            raise InvalidRadiusError
+
+        self.z = complex(z)
+        self.N = N
+        self.R = R
+
+    # --------------------------------------------------------------------------
+    def __repr__(self):
+        return 'CircularRecharge({0.z!r},{0.N!r},{0.R!r})'.format(self)
+
+    # --------------------------------------------------------------------------
+    def __str__(self):
+        return 'CircularRecharge(z={0.z!s},N={0.N!s},R={0.R!s})'.format(self)
+
+    # --------------------------------------------------------------------------
+    def _local(self, z):
+        """Return the locations <z> relative to the center, as complex."""
+        z = numpy.asarray(z)
+        z = z.astype(numpy.result_type(z, numpy.complex64))
+        return z - complex(self.z)
+
+    # --------------------------------------------------------------------------
+    def inside(self, z):
+        """
+        Classify the location(s) <z> as inside the recharge circle.
+
+        Arguments:
+            z (complex or ndarray): 'little z' world coordinate location [L].
+
+        Returns:
+            bool or ndarray: True where <z> is strictly inside the circle.
+
+        """
+        zz = self._local(z)
+        return (numpy.abs(zz) < self.R)[()]
+
+    # --------------------------------------------------------------------------
+    def complex_potential(self, z):
+        """
+        CircularRecharge's complex potential at location <z>.
+
+        Return the recharge circle's contribution to the complex potential,
+        Omega(z) [L^3/T], evaluated at location <z>.
+
+        Arguments:
+            z (complex or ndarray): 'little z' world coordinate location [L].
+
+        Returns:
+            complex or ndarray: complex potential at location <z> [L^3/T].
+
+        Notes:
+        -   Outside of the circle the element is identical to an injection
+            well with discharge -N*pi*R^2.
+
+        -   Inside of the circle the stream function does not exist, so the
+            imaginary part of the returned complex potential is NaN.
+
+        """
+        zz = self._local(z)
+        r2 = zz.real**2 + zz.imag**2
+        inside = r2 < self.R**2
+
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            Omega_out = -0.5*self.N*self.R**2 * numpy.log(zz)
+        Phi_in = (0.25*self.N*(self.R**2 - r2)
+                  - 0.5*self.N*self.R**2 * math.log(self.R))
+
+        Omega = numpy.where(inside, Phi_in + complex(0, numpy.nan), Omega_out)
+        return Omega[()]
+
+    # --------------------------------------------------------------------------
+    def complex_discharge(self, z):
+        """
+        CircularRecharge's complex discharge at location <z>.
+
+        Return the recharge circle's contribution to the complex discharge
+        function, W(z) [L^2/T], at location <z>.
+
+        Arguments:
+            z (complex or ndarray): 'little z' world coordinate location [L].
+
+        Returns:
+            complex or ndarray: complex discharge at location <z> [L^2/T].
+
+        """
+        zz = self._local(z)
+        inside = numpy.abs(zz) < self.R
+
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            W_out = 0.5*self.N*self.R**2 / zz
+        W_in = 0.5*self.N * numpy.conj(zz)
+
+        W = numpy.where(inside, W_in, W_out)
+        return W[()]
+
+    # --------------------------------------------------------------------------
+    def abstraction(self):
+        """
+        CircularRecharge's abstraction from the aquifer.
+
+        Returns:
+            float: abstraction from the aquifer [L^3/T].
+
+        Notes:
+        -   Recharge adds water to the aquifer, so the abstraction is the
+            negative of the total recharge, -N*pi*R^2.
+
+        """
+        return -self.N * math.pi * self.R**2
+
+    # --------------------------------------------------------------------------
+    def divergence_discharge(self, z):
+        """
+        CircularRecharge's divergence of the discharge at location <z>.
+
+        Arguments:
+            z (complex or ndarray): 'little z' world coordinate location [L].
+
+        Returns:
+            float or ndarray: divergence of the discharge at location <z>
+                [L/T].
+
+        Notes:
+        -   The divergence of the discharge is N inside of the circle, and 0
+            outside of the circle.
+
+        """
+        return numpy.where(self.inside(z), float(self.N), float(0))[()]
+
+    # --------------------------------------------------------------------------
+    def solve(self, geo, root):
+        """
+        """
+        raise NotImplementedError('"solve" is not yet implemented.')
@@ -0,0 +1,364 @@
+"""<cli.py> implements the ginebig command-line batch runner.
+
+This file is part of the Ginebig Project and is distributed under the
+BSD-3-Clause license. See the accompanying LICENSE.txt file.
+
+Copyright (c) 2017, Randal J. Barnes
+
+A job manifest is a JSON file:
+
+    {
+        "model": "model.json",
+        "output": "results",
+        "workers": 4,
+        "tasks": [
+            {"name": "ref", "type": "solve"},
+            {"name": "obs", "type": "points", "points": [[0, 0], [10, 5]],
+             "quantity": "head"},
+            {"name": "map", "type": "grid", "xmin": 0, "xmax": 1000,
+             "ymin": 0, "ymax": 500, "nx": 201, "ny": 101},
+            {"name": "paths", "type": "track", "points": [[0, 0]],
+             "step": 5, "nsteps": 400, "backward": false}
+        ]
+    }
+
+Relative paths are relative to the manifest. A model file is also JSON:
+
+    {
+        "geology": {"hydraulic_conductivity": 10, "aquifer_porosity": 0.25,
+                    "aquifer_thickness": 20, "base_elevation": 100},
+        "elements": [
+            {"type": "Well", "z": [300, 700], "Q": 500, "r": 0.2},
+            {"type": "UniformFlow", "Qo": 1, "alpha": 0.5},
+            {"type": "ReferencePoint", "z": [5000, 0], "head": 125}
+        ]
+    }
+
+Element arguments are passed by keyword. Locations (the arguments whose
+names start with z) are [x, y] pairs, "vertices" is a list of pairs, and
+"wells" is a list of Well elements. An element with "active": false is
+deactivated.
+
+The model is loaded and solved once, then handed to each worker process
+once; the tasks are spread across the workers. The result arrays of each
+task are saved as <output>/<name>.npz, and a line with the wall-clock time
+and the peak traced memory of each task is printed as it completes. The
+whole report is also saved as <output>/summary.json.
+
+Only the standard library is imported at start-up; numpy, scipy and the
+elements are imported when they are first needed.
+"""
+
+import argparse
+import concurrent.futures
+import importlib
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+__version__ = '07 June 2017'
+
+
+# ------------------------------------------------------------------------------
+class Error(Exception):
+    """Base class for all exceptions raised by this module."""
+
+
+class InvalidManifestError(Error):
+    """The job manifest or the model file is malformed."""
+
+
+# ------------------------------------------------------------------------------
+# The element types that may appear in a model file, and their modules.
+ELEMENTS = {
+    'Well': 'ginebig.well',
+    'UniformFlow': 'ginebig.uniform_flow',
+    'ReferencePoint': 'ginebig.reference_point',
+    'CircularRecharge': 'ginebig.circular_recharge',
+    'PolygonRecharge': 'ginebig.polygon_recharge',
+    'LineBoundary': 'ginebig.image_boundary',
+    'WedgeBoundary': 'ginebig.image_boundary',
+    'StripBoundary': 'ginebig.image_boundary',
+}
+
+
+# ------------------------------------------------------------------------------
+def _argument(key, value):
+    """Convert the JSON element argument <value> named <key>."""
+    if key == 'wells':
+        return [_element(spec) for spec in value]
+    if key == 'vertices':
+        return [complex(*xy) for xy in value]
+    if key.startswith('z'):
+        return complex(*value)
+    return value
+
+
+def _element(spec):
+    """Build an analytic element from its JSON <spec>."""
+    spec = dict(spec)
+    name = spec.pop('type', None)
+    if name not in ELEMENTS:
+        raise InvalidManifestError('unknown element type {0!r}'.format(name))
+
+    cls = getattr(importlib.import_module(ELEMENTS[name]), name)
+    active = spec.pop('active', True)
+    try:
+        element = cls(**{key: _argument(key, value)
+                         for key, value in spec.items()})
+    except TypeError as err:
+        raise InvalidManifestError('{0}: {1}'.format(name, err))
+    if not active:
+        element.deactivate()
+    return element
+
+
+def load_model(path: str):
+    """
+    Load a model from a JSON model file.
+
+    Arguments:
+        path (str): name of the model file.
+
+    Returns:
+        Model: the unsolved model.
+
+    Raises:
+        InvalidManifestError: The job manifest or the model file is
+            malformed.
+    """
+    from ginebig.geology import Geology
+    from ginebig.model import Model
+
+    with open(path) as f:
+        doc = json.load(f)
+    try:
+        geo = Geology(**doc['geology'])
+    except (KeyError, TypeError) as err:
+        raise InvalidManifestError('geology: {0}'.format(err))
+    return Model(geo, [_element(spec) for spec in doc.get('elements', [])])
+
+
+# ------------------------------------------------------------------------------
+def _points(task, base):
+    """Return the complex locations of a task, from a list or a file."""
+    import numpy
+
+    if 'points' in task:
+        xy = numpy.asarray(task['points'], dtype=float)
+    elif 'file' in task:
+        path = os.path.join(base, task['file'])
+        if path.endswith('.npy'):
+            xy = numpy.load(path)
+        else:
+            delimiter = ',' if path.endswith('.csv') else None
+            xy = numpy.loadtxt(path, delimiter=delimiter, ndmin=2)
+    else:
+        raise InvalidManifestError('task needs "points" or "file"')
+
+    if numpy.iscomplexobj(xy):
+        return xy
+    return xy[..., 0] + 1j*xy[..., 1]
+
+
+def _run_solve(model, task, base):
+    """Re-solve the model and report the constant."""
+    model.solve()
+    return {}, {'constant': model.constant}
+
+
+def _run_points(model, task, base):
+    """Evaluate a quantity at a list of locations."""
+    z = _points(task, base)
+    quantity = task.get('quantity', 'head')
+    precision = task.get('precision', 'double')
+    if quantity == 'head':
+        result = model.head(z, precision)
+    elif quantity == 'potential':
+        result = model.complex_potential(z, precision)
+    elif quantity == 'discharge':
+        result = model.complex_discharge(z, precision)
+    elif quantity == 'velocity':
+        from ginebig.tracking import velocity
+        result = velocity(model, z)
+    else:
+        raise InvalidManifestError('unknown quantity {0!r}'.format(quantity))
+    return {quantity: result}, {'points': int(result.size)}
+
+
+def _run_grid(model, task, base):
+    """Evaluate the heads on a regular grid."""
+    args = [task[key] for key in ('xmin', 'xmax', 'ymin', 'ymax', 'nx', 'ny')]
+    heads = model.head_grid(*args, precision=task.get('precision', 'double'))
+    return {'head': heads}, {'points': int(heads.size)}
+
+
+def _run_track(model, task, base):
+    """Trace pathlines from a list of locations."""
+    from ginebig.tracking import track
+    paths, times = track(model, _points(task, base), task['step'],
+                         task['nsteps'], task.get('backward', False))
+    return {'paths': paths, 'times': times}, {'particles': len(paths)}
+
+
+# The task types, and the functions that run them. Each function returns a
+# dict of result arrays and a dict of extra items for the report.
+TASKS = {
+    'solve': _run_solve,
+    'points': _run_points,
+    'grid': _run_grid,
+    'track': _run_track,
+}
+
+
+# ------------------------------------------------------------------------------
+# The model and the directories of the current process, set by _initialize.
+_state = {}
+
+
+def _initialize(model, base, output):
+    """Install the solved <model> in this (worker) process."""
+    _state['model'] = model
+    _state['base'] = base
+    _state['output'] = output
+
+
+def _execute(index, task):
+    """Run one task in this process and return its report."""
+    name = task.get('name', 'task{0}'.format(index))
+    report = {'index': index, 'name': name, 'type': task.get('type')}
+
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    try:
+        if report['type'] not in TASKS:
+            raise InvalidManifestError(
+                'unknown task type {0!r}'.format(report['type']))
+        arrays, extra = TASKS[report['type']](_state['model'], task,
+                                              _state['base'])
+        if arrays:
+            import numpy
+            path = os.path.join(_state['output'], name + '.npz')
+            numpy.savez(path, **arrays)
+            report['output'] = path
+        report.update(extra)
+    except Exception as err:
+        report['error'] = '{0}: {1}'.format(type(err).__name__, err)
+    report['seconds'] = time.perf_counter() - start
+    report['peak_bytes'] = tracemalloc.get_traced_memory()[1]
+    return report
+
+
+def _print_report(report, stream):
+    """Print the one-line report of a task."""
+    line = '{name:<20} {type!s:<7} {seconds:10.3f} s {mib:10.1f} MiB'.format(
+        mib=report['peak_bytes'] / 2**20, **report)
+    if 'error' in report:
+        line += '  FAILED ' + report['error']
+    print(line, file=stream, flush=True)
+
+
+# ------------------------------------------------------------------------------
+def run(manifest: str, workers: int = None, output: str = None,
+        stream=sys.stdout):
+    """
+    Run the tasks of a job manifest.
+
+    Arguments:
+        manifest (str): name of the JSON job manifest.
+        workers (int): number of worker processes; overrides the manifest.
+            With one worker the tasks run in this process.
+        output (str): output directory; overrides the manifest. Unlike the
+            "output" of the manifest, it is relative to the current
+            directory.
+        stream (file): where the reports are printed, or None.
+
+    Returns:
+        dict: the summary, also saved as <output>/summary.json.
+
+    Raises:
+        InvalidManifestError: The job manifest or the model file is
+            malformed.
+    """
+    base = os.path.dirname(os.path.abspath(manifest))
+    with open(manifest) as f:
+        job = json.load(f)
+    if 'model' not in job or not isinstance(job.get('tasks', []), list):
+        raise InvalidManifestError('a manifest needs "model" and "tasks"')
+
+    if output is None:
+        output = os.path.join(base, job.get('output', '.'))
+    output = os.path.abspath(output)
+    workers = workers or job.get('workers', 1)
+    os.makedirs(output, exist_ok=True)
+
+    start = time.perf_counter()
+    model = load_model(os.path.join(base, job['model']))
+    model.solve()
+    summary = {'manifest': os.path.abspath(manifest), 'workers': workers,
+               'load_seconds': time.perf_counter() - start, 'tasks': []}
+    if stream is not None:
+        print('{0:<20} {1:<7} {2:10.3f} s'.format(
+            'model', 'load', summary['load_seconds']), file=stream)
+
+    tasks = list(enumerate(job.get('tasks', [])))
+    reports = []
+    if workers <= 1:
+        # Leave the caller's process as it was found.
+        tracing = tracemalloc.is_tracing()
+        _initialize(model, base, output)
+        try:
+            for index, task in tasks:
+                reports.append(_execute(index, task))
+                if stream is not None:
+                    _print_report(reports[-1], stream)
+        finally:
+            if not tracing:
+                tracemalloc.stop()
+    else:
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers=workers, initializer=_initialize,
+                initargs=(model, base, output)) as pool:
+            futures = [pool.submit(_execute, index, task)
+                       for index, task in tasks]
+            for future in concurrent.futures.as_completed(futures):
+                reports.append(future.result())
+                if stream is not None:
+                    _print_report(reports[-1], stream)
+
+    summary['tasks'] = sorted(reports, key=lambda report: report['index'])
+    summary['total_seconds'] = time.perf_counter() - start
+    with open(os.path.join(output, 'summary.json'), 'w') as f:
+        json.dump(summary, f, indent=2)
+    return summary
+
+
+# ------------------------------------------------------------------------------
+def main(argv=None) -> int:
+    """Entry point of the ginebig console command."""
+    parser = argparse.ArgumentParser(
+        prog='ginebig',
+        description='Run the tasks of a Ginebig job manifest.')
+    parser.add_argument('manifest', help='JSON job manifest')
+    parser.add_argument('-w', '--workers', type=int,
+                        help='number of worker processes')
+    parser.add_argument('-o', '--output', help='output directory')
+    parser.add_argument('-q', '--quiet', action='store_true',
+                        help='do not print the per-task reports')
+    args = parser.parse_args(argv)
+
+    try:
+        summary = run(args.manifest, args.workers, args.output,
+                      None if args.quiet else sys.stdout)
+    except (Error, OSError, ValueError) as err:
+        print('ginebig: error: {0}'.format(err), file=sys.stderr)
+        return 2
+    return 1 if any('error' in task for task in summary['tasks']) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
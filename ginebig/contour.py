@@ -0,0 +1,259 @@
+"""<contour.py> implements the ContourBuilder class.
+
+This file is part of the Ginebig Project and is distributed under the
+BSD-3-Clause license. See the accompanying LICENSE.txt file.
+
+Copyright (c) 2017, Randal J. Barnes
+"""
+
+import collections
+
+import numpy
+
+__version__ = '07 June 2017'
+
+
+# ------------------------------------------------------------------------------
+class Error(Exception):
+    """Base class for all exceptions raised by this module."""
+
+
+class InvalidTileError(Error):
+    """A tile must be a 2-D array with at least two rows and two columns."""
+
+
+# ------------------------------------------------------------------------------
+# The marching squares segments for each cell case. The case is the sum of
+# 1, 2, 4 and 8 for the corners (r,c), (r,c+1), (r+1,c+1) and (r+1,c) that
+# are above the level. The cell edges are 0 bottom, 1 right, 2 top, 3 left.
+# The saddle cases 5 and 10 are resolved by the mean of the four corners:
+# the first entry is used when the center is above the level.
+SEGMENTS = {
+    1: [(3, 0)], 2: [(0, 1)], 3: [(3, 1)], 4: [(1, 2)],
+    6: [(0, 2)], 7: [(3, 2)], 8: [(2, 3)], 9: [(0, 2)],
+    11: [(1, 2)], 12: [(3, 1)], 13: [(0, 1)], 14: [(3, 0)],
+}
+SADDLES = {
+    5: ([(0, 1), (2, 3)], [(3, 0), (1, 2)]),
+    10: ([(3, 0), (1, 2)], [(0, 1), (2, 3)]),
+}
+
+
+# ------------------------------------------------------------------------------
+class ContourBuilder(object):
+    """Marching squares contours of a gridded field, built tile by tile.
+
+    The field (e.g. heads from Model.head_grid, or the stream function from
+    Model.complex_potential(...).imag) is sampled at the nodes of a regular
+    grid: node (r, c) is at x0 + c*dx, y0 + r*dy. The grid may be supplied
+    in tiles of any size, in any order; tiles that share their edge nodes
+    (such as the tiles of a TilePyramid level) join seamlessly.
+
+    Every segment endpoint lies on a grid edge, and is keyed by the global
+    index of that edge, so segments from neighboring cells and tiles are
+    stitched exactly, without comparing floating point coordinates. The
+    cell classification and the edge interpolation are vectorized; only the
+    stitching visits the segments one at a time.
+
+    Contours are returned as compact complex arrays of vertices, x + iy. A
+    closed contour repeats its first vertex at the end. Cells with a NaN
+    corner (e.g. inside a well) are skipped.
+    """
+
+    # --------------------------------------------------------------------------
+    def __init__(self, levels, x0: float, y0: float, dx: float, dy: float):
+        """Initialize the ContourBuilder class.
+
+        Arguments:
+            levels (sequence of float): the contour levels.
+            x0, y0 (float): location of global node (0, 0) [L].
+            dx, dy (float): grid spacing [L].
+        """
+        self.levels = [float(level) for level in numpy.atleast_1d(levels)]
+        self.x0 = x0
+        self.y0 = y0
+        self.dx = dx
+        self.dy = dy
+
+        self._ends = [dict() for level in self.levels]
+        self._closed = [[] for level in self.levels]
+
+    # --------------------------------------------------------------------------
+    def add_tile(self, values, row0: int = 0, col0: int = 0):
+        """
+        Add a tile of the gridded field.
+
+        Arguments:
+            values (ndarray): (nrows, ncols) field values; values[i, j] is at
+                global node (row0 + i, col0 + j).
+            row0, col0 (int): global index of the tile's first node.
+
+        Raises:
+            InvalidTileError: A tile must be a 2-D array with at least two
+                rows and two columns.
+        """
+        values = numpy.asarray(values)
+        if values.ndim != 2 or min(values.shape) < 2:
+            raise InvalidTileError
+
+        for k, level in enumerate(self.levels):
+            for seg in self._segments(values, level, row0, col0):
+                self._stitch(k, *seg)
+
+    # --------------------------------------------------------------------------
+    def _segments(self, values, level, row0, col0):
+        """Yield (key_a, z_a, key_b, z_b) for every segment at the <level>."""
+        v00 = values[:-1, :-1]
+        v01 = values[:-1, 1:]
+        v11 = values[1:, 1:]
+        v10 = values[1:, :-1]
+
+        case = ((v00 > level).astype(numpy.uint8)
+                + 2*(v01 > level) + 4*(v11 > level) + 8*(v10 > level))
+        valid = numpy.isfinite(v00 + v01 + v11 + v10)
+        case[~valid] = 0
+
+        # Only the cells crossed by the contour are visited from here on.
+        r, q = numpy.nonzero((case != 0) & (case != 15))
+        case = case[r, q]
+
+        center = 0.25*(v00[r, q] + v01[r, q] + v11[r, q] + v10[r, q]) > level
+        case[((case == 5) | (case == 10)) & ~center] += 16
+
+        table = dict(SEGMENTS)
+        for c, (high, low) in SADDLES.items():
+            table[c] = high
+            table[c + 16] = low
+
+        for c, pairs in table.items():
+            mask = case == c
+            if not mask.any():
+                continue
+            for ea, eb in pairs:
+                ka, za = self._edge(ea, values, level, r[mask], q[mask],
+                                    row0, col0)
+                kb, zb = self._edge(eb, values, level, r[mask], q[mask],
+                                    row0, col0)
+                yield from zip(ka, za, kb, zb)
+
+    # --------------------------------------------------------------------------
+    def _edge(self, edge, values, level, r, q, row0, col0):
+        """Global edge keys and crossing locations for the cells (r, q)."""
+        if edge == 0:
+            a, b, rr, cc, horizontal = values[r, q], values[r, q+1], r, q, 1
+        elif edge == 1:
+            a, b, rr, cc, horizontal = values[r, q+1], values[r+1, q+1], \
+                r, q+1, 0
+        elif edge == 2:
+            a, b, rr, cc, horizontal = values[r+1, q], values[r+1, q+1], \
+                r+1, q, 1
+        else:
+            a, b, rr, cc, horizontal = values[r, q], values[r+1, q], r, q, 0
+
+        t = (level - a) / (b - a)
+        rr = rr + row0
+        cc = cc + col0
+        if horizontal:
+            z = (self.x0 + (cc + t)*self.dx) + 1j*(self.y0 + rr*self.dy)
+        else:
+            z = (self.x0 + cc*self.dx) + 1j*(self.y0 + (rr + t)*self.dy)
+
+        keys = zip(rr.tolist(), cc.tolist(), [horizontal]*rr.size)
+        return keys, z.tolist()
+
+    # --------------------------------------------------------------------------
+    def _stitch(self, k, ka, za, kb, zb):
+        """Join the segment (ka, za)-(kb, zb) to the open contours."""
+        ends = self._ends[k]
+        la = ends.pop(ka, None)
+        lb = ends.pop(kb, None)
+
+        if la is None and lb is None:
+            line = [collections.deque([za, zb]), ka, kb]
+            ends[ka] = ends[kb] = line
+        elif lb is None:
+            self._extend(la, ka, zb, kb)
+            ends[kb] = la
+        elif la is None:
+            self._extend(lb, kb, za, ka)
+            ends[ka] = lb
+        elif la is lb:
+            la[0].append(la[0][0])
+            self._closed[k].append(numpy.array(la[0]))
+        else:
+            # Orient la to end at ka, and lb to start at kb, then join.
+            if la[1] == ka:
+                la[0].reverse()
+                la[1], la[2] = la[2], la[1]
+            if lb[2] == kb:
+                lb[0].reverse()
+                lb[1], lb[2] = lb[2], lb[1]
+            la[0].extend(lb[0])
+            la[2] = lb[2]
+            ends[la[2]] = la
+
+    # --------------------------------------------------------------------------
+    @staticmethod
+    def _extend(line, key, z, newkey):
+        """Add vertex <z> at the end of <line> currently keyed by <key>."""
+        if line[2] == key:
+            line[0].append(z)
+            line[2] = newkey
+        else:
+            line[0].appendleft(z)
+            line[1] = newkey
+
+    # --------------------------------------------------------------------------
+    def pop_closed(self):
+        """
+        Return and forget the closed contours completed so far.
+
+        Returns:
+            dict: level -> list of complex vertex arrays.
+        """
+        closed = {level: lines
+                  for level, lines in zip(self.levels, self._closed)}
+        self._closed = [[] for level in self.levels]
+        return closed
+
+    # --------------------------------------------------------------------------
+    def contours(self):
+        """
+        Return and forget all contours, closed and open.
+
+        Contours still open (e.g. those ending on the edge of the grid) are
+        returned as open polylines.
+
+        Returns:
+            dict: level -> list of complex vertex arrays.
+        """
+        result = self.pop_closed()
+        for level, ends in zip(self.levels, self._ends):
+            seen = set()
+            for line in ends.values():
+                if id(line) not in seen:
+                    seen.add(id(line))
+                    result[level].append(numpy.array(line[0]))
+        self._ends = [dict() for level in self.levels]
+        return result
+
+
+# ------------------------------------------------------------------------------
+def contours(values, xmin: float, xmax: float, ymin: float, ymax: float,
+             levels):
+    """Return the contours of a single grid, as from model.grid().
+
+    Arguments:
+        values (ndarray): (ny, nx) field values on the grid.
+        xmin, xmax (float): range of the x coordinates [L].
+        ymin, ymax (float): range of the y coordinates [L].
+        levels (sequence of float): the contour levels.
+
+    Returns:
+        dict: level -> list of complex vertex arrays.
+    """
+    ny, nx = numpy.shape(values)
+    builder = ContourBuilder(levels, xmin, ymin,
+                             (xmax - xmin)/(nx - 1), (ymax - ymin)/(ny - 1))
+    builder.add_tile(values)
+    return builder.contours()
@@ -6,7 +6,7 @@ BSD-3-Clause license. See the accompanying LICENSE.txt file.
 Copyright (c) 2017, Randal J. Barnes
 """
 
-import math
+import numpy
 
 __version__ = '07 June 2017'
 
@@ -46,7 +46,8 @@ class Geology(object):
                  hydraulic_conductivity: float,
                  aquifer_porosity: float,
                  aquifer_thickness: float,
-                 base_elevation: float):
+                 base_elevation: float,
+                 aquifer_storativity: float = None):
         """Initialize the Geology class.
 
         Arguments:
@@ -55,6 +56,9 @@ class Geology(object):
             aquifer_porosity (float): The homogeneous aquifer porosity [].
             aquifer_thickness (float): The homogeneous aquifer thickness [L].
             base_elevation (float): The homogeneous base elevation [L].
+            aquifer_storativity (float): The homogeneous aquifer storativity
+                []. If None, the porosity is used as the specific yield of an
+                unconfined aquifer.
         """
 
         self.hydraulic_conductivity = hydraulic_conductivity
@@ -62,11 +66,15 @@ class Geology(object):
         self.aquifer_thickness = aquifer_thickness
         self.base_elevation = base_elevation
 
+        if aquifer_storativity is None:
+            aquifer_storativity = aquifer_porosity
+        self.aquifer_storativity = aquifer_storativity
+
     # --------------------------------------------------------------------------
     def __repr__(self):
         return 'Geology({0.hydraulic_conductivity!r},' \
                '{0.aquifer_porosity!r},{0.aquifer_thickness!r},' \
-               '{0.base_elevation!r})'.format(self)
+               '{0.base_elevation!r},{0.aquifer_storativity!r})'.format(self)
 
     # --------------------------------------------------------------------------
     def __str__(self):
@@ -86,40 +94,145 @@ class Geology(object):
         return p
 
     # --------------------------------------------------------------------------
-    def head2Phi(self, head: float, z: complex) -> float:
+    def transmissivity(self, z: complex) -> float:
+        """Return the aquifer transmissivity, k*H [L^2/T]."""
+        k, rho, H, b = self.properties(z)
+        return k*H
+
+    # --------------------------------------------------------------------------
+    def storativity(self, z: complex) -> float:
+        """Return the aquifer storativity []."""
+        return self.aquifer_storativity
+
+    # --------------------------------------------------------------------------
+    def head2Phi(self, head, z: complex):
         """Convert the head to a discharge potential.
 
+        Arguments:
+            head (float or ndarray): head [L].
+            z (complex): 'little z' world coordinate location [L].
+
+        Returns:
+            float or ndarray: discharge potential [L^3/T].
+
+        Raises:
+            InvalidHeadError: The head must be above the base of the aquifer.
+        """
+
+        k, rho, H, b = self.properties(z)
+
+        head = numpy.asarray(head, dtype=float)
+        if numpy.any(head <= b):
+            raise InvalidHeadError
+
+        Phi = numpy.where(head >= b+H,
+                          k*H*(head-b) - 0.5*k*H**2,
+                          0.5 * k * (head-b)**2)
+        return Phi[()]
+
+    # --------------------------------------------------------------------------
+    def head2Phi_gradient(self, head, z: complex):
+        """Return the partial derivatives of head2Phi.
+
+        Arguments:
+            head (float or ndarray): head [L].
+            z (complex): 'little z' world coordinate location [L].
+
+        Returns:
+            tuple: the partial derivatives of the discharge potential with
+                respect to the head, k, H and b, each with the shape of
+                <head>.
+
         Raises:
             InvalidHeadError: The head must be above the base of the aquifer.
+
+        Notes:
+        -   Confined (head >= b+H): Phi = k H (head-b) - k H^2/2.
+            Unconfined: Phi = k (head-b)^2/2. The derivatives of the two
+            branches agree at head = b+H, so there is no jump at the
+            transition.
         """
 
         k, rho, H, b = self.properties(z)
 
-        if head >= b+H:
-            Phi = k*H*(head-b) - 0.5*k*H**2
-        elif head > b:
-            Phi = 0.5 * k * (head-b)**2
-        else:
+        head = numpy.asarray(head, dtype=float)
+        if numpy.any(head <= b):
             raise InvalidHeadError
 
-        return Phi
+        confined = head >= b+H
+        s = head - b
+        dhead = numpy.where(confined, k*H, k*s)
+        dk = numpy.where(confined, H*s - 0.5*H**2, 0.5*s**2)
+        dH = numpy.where(confined, k*(s - H), 0*s)
+        db = -dhead
+        return dhead[()], dk[()], dH[()], db[()]
 
     # --------------------------------------------------------------------------
-    def Phi2head(self, Phi: float, z: complex) -> float:
+    def Phi2head(self, Phi, z: complex):
         """Convert the discharge potential to a head.
 
+        Arguments:
+            Phi (float or ndarray): discharge potential [L^3/T].
+            z (complex): 'little z' world coordinate location [L].
+
+        Returns:
+            float or ndarray: head [L].
+
+        Raises:
+            InvalidDischargePotentialError: The discharge potential must be
+                positive.
+
+        Notes:
+        -   NaN discharge potentials (e.g. inside of a well) are returned as
+            NaN heads.
+        """
+
+        k, rho, H, b = self.properties(z)
+
+        Phi = numpy.asarray(Phi, dtype=float)
+        if numpy.any(Phi <= 0):
+            raise InvalidDischargePotentialError
+
+        confined = Phi >= 0.5*k*H**2
+        head = numpy.where(confined,
+                           Phi/(k*H) + H/2 + b,
+                           numpy.sqrt(numpy.where(confined, 0, 2*Phi/k)) + b)
+        return head[()]
+
+    # --------------------------------------------------------------------------
+    def Phi2head_gradient(self, Phi, z: complex):
+        """Return the partial derivatives of Phi2head.
+
+        Arguments:
+            Phi (float or ndarray): discharge potential [L^3/T].
+            z (complex): 'little z' world coordinate location [L].
+
+        Returns:
+            tuple: the partial derivatives of the head with respect to Phi,
+                k, H and b, each with the shape of <Phi>.
+
         Raises:
             InvalidDischargePotentialError: The discharge potential must be
                 positive.
+
+        Notes:
+        -   Confined (Phi >= k H^2/2): head = Phi/(k H) + H/2 + b.
+            Unconfined: head = sqrt(2 Phi/k) + b. The derivatives of the
+            two branches agree at Phi = k H^2/2, so there is no jump at the
+            transition.
+        -   NaN discharge potentials are returned as NaN derivatives.
         """
 
         k, rho, H, b = self.properties(z)
 
-        if Phi >= 0.5*k*H**2:
-            head = Phi/(k*H) + H/2 + b
-        elif Phi > 0:
-            head = math.sqrt(2*Phi/k) + b
-        else:
+        Phi = numpy.asarray(Phi, dtype=float)
+        if numpy.any(Phi <= 0):
             raise InvalidDischargePotentialError
 
-        return head
+        confined = Phi >= 0.5*k*H**2
+        s = numpy.sqrt(numpy.where(confined, 0.5*H**2, 2*Phi/k))
+        dPhi = numpy.where(confined, 1/(k*H), 1/(k*s))
+        dk = numpy.where(confined, -Phi/(k**2*H), -s/(2*k))
+        dH = numpy.where(confined, 0.5 - Phi/(k*H**2), 0*Phi)
+        db = 1 + 0*Phi
+        return dPhi[()], dk[()], dH[()], db[()]
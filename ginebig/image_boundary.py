@@ -0,0 +1,495 @@
+"""<image_boundary.py> implements the straight-boundary image elements.
+
+This file is part of the Ginebig Project and is distributed under the
+BSD-3-Clause license. See the accompanying LICENSE.txt file.
+
+Copyright (c) 2017, Randal J. Barnes
+"""
+
+import abc
+import cmath
+import copy
+
+import numpy
+
+from ginebig.analytic_element import AnalyticElement
+
+__version__ = '07 June 2017'
+
+
+# ------------------------------------------------------------------------------
+class Error(Exception):
+    """Base class for all exceptions raised by this module."""
+
+
+class InvalidKindError(Error):
+    """The boundary kind must be either 'head' or 'noflow'."""
+
+
+class InvalidGeometryError(Error):
+    """The boundary lines are degenerate."""
+
+
+class InvalidAngleError(Error):
+    """The wedge angle must be pi/n, with n even for mixed boundary kinds."""
+
+
+# ------------------------------------------------------------------------------
+KINDS = {
+    'head': -1.0,       # constant head: images of opposite sign.
+    'noflow': 1.0,      # no flow: images of the same sign.
+}
+
+
+def _sign(kind):
+    """Return the image sign for the boundary <kind>."""
+    try:
+        return KINDS[kind]
+    except KeyError:
+        raise InvalidKindError from None
+
+
+def _reflect(p, a, e):
+    """Reflect <p> across the line through <a> with unit direction <e>."""
+    return a + e*e * numpy.conj(p - a)
+
+
+# ------------------------------------------------------------------------------
+class ImageBoundary(AnalyticElement):
+    """Base class for straight boundaries modeled by the method of images.
+
+    An image boundary contributes the images of its wells, which are
+    separate elements of the model. The images are never materialized as
+    Well objects: a boundary with finitely many images packs them into
+    arrays (see FiniteImageBoundary), and a StripBoundary sums its infinite
+    rows of images in closed form.
+
+    Only the wells given to the boundary are imaged; the boundary conditions
+    are met exactly for those wells.
+
+    Boundary kinds:
+        'head': a constant head boundary (e.g. a fully penetrating river).
+        'noflow': a no-flow boundary (e.g. a bedrock wall).
+    """
+
+    # --------------------------------------------------------------------------
+    def __init__(self, wells):
+        self.wells = list(wells)
+
+    # --------------------------------------------------------------------------
+    def translated(self, dz: complex):
+        """
+        Return a copy of the boundary, and its wells, translated by <dz>.
+
+        Arguments:
+            dz (complex): translation [L].
+
+        Returns:
+            ImageBoundary: the translated copy.
+
+        """
+        other = copy.copy(self)
+        for name in self._points:
+            setattr(other, name, getattr(self, name) + dz)
+        other.wells = [well.translated(dz) for well in self.wells]
+        return other
+
+    # --------------------------------------------------------------------------
+    def abstraction(self):
+        """
+        ImageBoundary's abstraction from the aquifer.
+
+        Returns:
+            float: abstraction from the aquifer [L^3/T].
+
+        Notes:
+        -   If any of the lines is a constant head boundary, it supplies all
+            of the water pumped by the wells, so the abstraction is the
+            negative of their total discharge. Otherwise it is 0.
+
+        """
+        if any(kind == 'head' for kind in self.kinds):
+            return -sum(well.Q for well in self.wells)
+        return float(0)
+
+    # --------------------------------------------------------------------------
+    def divergence_discharge(self, z):
+        """
+        ImageBoundary's divergence of the discharge at location <z>.
+
+        Arguments:
+            z (complex or ndarray): 'little z' world coordinate location [L].
+
+        Returns:
+            float or ndarray: divergence of the discharge at location <z>
+                [L/T].
+
+        Notes:
+        -   The images lie outside of the flow domain, so the divergence of
+            the discharge is 0 everywhere in the domain.
+
+        """
+        return numpy.zeros(numpy.shape(z))[()]
+
+    # --------------------------------------------------------------------------
+    def solve(self, geo, root):
+        """
+        """
+        raise NotImplementedError('"solve" is not yet implemented.')
+
+
+# ------------------------------------------------------------------------------
+class FiniteImageBoundary(ImageBoundary):
+    """Base class for image boundaries with a finite set of images.
+
+    Each concrete boundary returns the packed arrays of image centers and
+    strengths from images(), and every image of every well is evaluated in
+    a single broadcast over the array of locations.
+    """
+
+    # --------------------------------------------------------------------------
+    @abc.abstractmethod
+    def images(self):
+        """Return the packed (centers, strengths) arrays of all images."""
+        raise NotImplementedError('"images" is not implemented.')
+
+    # --------------------------------------------------------------------------
+    def complex_potential(self, z):
+        """
+        FiniteImageBoundary's complex potential at location <z>.
+
+        Return the images' contribution to the complex potential,
+        Omega(z) [L^3/T], evaluated at location <z>.
+
+        Arguments:
+            z (complex or ndarray): 'little z' world coordinate location [L].
+
+        Returns:
+            complex or ndarray: complex potential at location <z> [L^3/T].
+
+        """
+        z = numpy.asarray(z)
+        centers, strengths = self.images()
+        ctype = numpy.result_type(z, numpy.complex64)
+
+        zz = z[..., numpy.newaxis] - centers.astype(ctype)
+        Omega = numpy.log(zz) @ (strengths / (2*cmath.pi)).astype(ctype)
+        return Omega[()]
+
+    # --------------------------------------------------------------------------
+    def complex_discharge(self, z):
+        """
+        FiniteImageBoundary's complex discharge at location <z>.
+
+        Return the images' contribution to the complex discharge function,
+        W(z) [L^2/T], at location <z>.
+
+        Arguments:
+            z (complex or ndarray): 'little z' world coordinate location [L].
+
+        Returns:
+            complex or ndarray: complex discharge at location <z> [L^2/T].
+
+        """
+        z = numpy.asarray(z)
+        centers, strengths = self.images()
+        ctype = numpy.result_type(z, numpy.complex64)
+
+        zz = z[..., numpy.newaxis] - centers.astype(ctype)
+        W = -(1/zz) @ (strengths / (2*cmath.pi)).astype(ctype)
+        return W[()]
+
+
+# ------------------------------------------------------------------------------
+class LineBoundary(FiniteImageBoundary):
+    """A single straight boundary through z1 and z2."""
+
+    _points = ('z1', 'z2')
+
+    # --------------------------------------------------------------------------
+    def __init__(self, z1: complex, z2: complex, kind: str, wells):
+        """
+        Intialize the attributes with minimal validation.
+
+        Arguments:
+           z1, z2 (complex): two distinct points on the boundary [L].
+           kind (str): 'head' or 'noflow'.
+           wells (sequence of Well): the wells to be imaged.
+
+        Raises:
+            image_boundary.InvalidKindError: The boundary kind must be either
+                'head' or 'noflow'.
+            image_boundary.InvalidGeometryError: The boundary lines are
+                degenerate.
+        """
+        _sign(kind)
+        if abs(z2 - z1) < numpy.finfo(float).eps:
+            raise InvalidGeometryError
+
+        super().__init__(wells)
+        self.z1 = z1
+        self.z2 = z2
+        self.kinds = (kind,)
+
+    # --------------------------------------------------------------------------
+    def __repr__(self):
+        return 'LineBoundary({0.z1!r},{0.z2!r},{0.kinds[0]!r},{0.wells!r})' \
+            .format(self)
+
+    # --------------------------------------------------------------------------
+    def images(self):
+        """Return the packed (centers, strengths) arrays of all images."""
+        e = (self.z2 - self.z1) / abs(self.z2 - self.z1)
+        zw = numpy.array([well.z for well in self.wells], dtype=complex)
+        Q = numpy.array([well.Q for well in self.wells], dtype=float)
+        return _reflect(zw, self.z1, e), _sign(self.kinds[0]) * Q
+
+
+# ------------------------------------------------------------------------------
+class WedgeBoundary(FiniteImageBoundary):
+    """Two straight boundaries meeting at a vertex.
+
+    The flow domain is the wedge between the ray from z0 through z1 and the
+    ray from z0 through z2. The wedge angle must be pi/n for an integer
+    n >= 2, and n must be even if the two boundaries are of different kinds;
+    each well then has 2n-1 images.
+    """
+
+    _points = ('z0', 'z1', 'z2')
+
+    # --------------------------------------------------------------------------
+    def __init__(self, z0: complex, z1: complex, kind1: str,
+                 z2: complex, kind2: str, wells):
+        """
+        Intialize the attributes with minimal validation.
+
+        Arguments:
+           z0 (complex): vertex of the wedge [L].
+           z1 (complex): a second point on the first boundary [L].
+           kind1 (str): 'head' or 'noflow' for the first boundary.
+           z2 (complex): a second point on the second boundary [L].
+           kind2 (str): 'head' or 'noflow' for the second boundary.
+           wells (sequence of Well): the wells to be imaged.
+
+        Raises:
+            image_boundary.InvalidKindError: The boundary kind must be either
+                'head' or 'noflow'.
+            image_boundary.InvalidGeometryError: The boundary lines are
+                degenerate.
+            image_boundary.InvalidAngleError: The wedge angle must be pi/n,
+                with n even for mixed boundary kinds.
+        """
+        s1, s2 = _sign(kind1), _sign(kind2)
+        eps = numpy.finfo(float).eps
+        if abs(z1 - z0) < eps or abs(z2 - z0) < eps:
+            raise InvalidGeometryError
+
+        theta = abs(cmath.phase((z2 - z0) / (z1 - z0)))
+        n = round(cmath.pi / theta) if theta > eps else 0
+        if n < 2 or abs(n*theta - cmath.pi) > 1e-9:
+            raise InvalidAngleError
+        if s1 != s2 and n % 2:
+            raise InvalidAngleError
+
+        super().__init__(wells)
+        self.z0 = z0
+        self.z1 = z1
+        self.z2 = z2
+        self.kinds = (kind1, kind2)
+        self.n = n
+
+    # --------------------------------------------------------------------------
+    def __repr__(self):
+        return 'WedgeBoundary({0.z0!r},{0.z1!r},{0.kinds[0]!r},{0.z2!r},' \
+               '{0.kinds[1]!r},{0.wells!r})'.format(self)
+
+    # --------------------------------------------------------------------------
+    def images(self):
+        """Return the packed (centers, strengths) arrays of all images."""
+        e1 = (self.z1 - self.z0) / abs(self.z1 - self.z0)
+        e2 = (self.z2 - self.z0) / abs(self.z2 - self.z0)
+        s1, s2 = (_sign(kind) for kind in self.kinds)
+
+        zw = numpy.array([well.z for well in self.wells], dtype=complex)
+        Q = numpy.array([well.Q for well in self.wells], dtype=float)
+
+        # Alternate the two reflections, starting with each line in turn.
+        # The words of length n from the two starts coincide, so only one
+        # of them is kept.
+        centers, strengths = [], []
+        for first in (0, 1):
+            p, s = zw, 1.0
+            for k in range(self.n - first):
+                if (k + first) % 2 == 0:
+                    p, s = _reflect(p, self.z0, e1), s*s1
+                else:
+                    p, s = _reflect(p, self.z0, e2), s*s2
+                centers.append(p)
+                strengths.append(s*Q)
+        return numpy.concatenate(centers), numpy.concatenate(strengths)
+
+
+# ------------------------------------------------------------------------------
+class StripBoundary(ImageBoundary):
+    """Two parallel straight boundaries.
+
+    The first boundary passes through z1 and z2, and the second boundary is
+    parallel to it through z3. The flow domain is the strip between them.
+
+    The images of a well in a strip form two infinite rows with period 2d,
+    where d is the width of the strip. Rather than truncating the image
+    series, each row is summed in closed form,
+
+        sum_k log(u - 2kdi) = log sin(pi u/(2di)) + const,
+        sum_k (-1)^k log(u - 2kdi) = log tan(pi u/(4di)) + const,
+
+    so the result is exact to rounding at any distance along the strip. The
+    additive constants are absorbed by the constant of integration.
+    """
+
+    _points = ('z1', 'z2', 'z3')
+
+    # --------------------------------------------------------------------------
+    def __init__(self, z1: complex, z2: complex, kind1: str,
+                 z3: complex, kind2: str, wells):
+        """
+        Intialize the attributes with minimal validation.
+
+        Arguments:
+           z1, z2 (complex): two distinct points on the first boundary [L].
+           kind1 (str): 'head' or 'noflow' for the first boundary.
+           z3 (complex): a point on the second boundary [L].
+           kind2 (str): 'head' or 'noflow' for the second boundary.
+           wells (sequence of Well): the wells to be imaged.
+
+        Raises:
+            image_boundary.InvalidKindError: The boundary kind must be either
+                'head' or 'noflow'.
+            image_boundary.InvalidGeometryError: The boundary lines are
+                degenerate.
+        """
+        _sign(kind1), _sign(kind2)
+        eps = numpy.finfo(float).eps
+        if abs(z2 - z1) < eps:
+            raise InvalidGeometryError
+
+        e = (z2 - z1) / abs(z2 - z1)
+        if abs((numpy.conj(e) * (z3 - z1)).imag) < eps:
+            raise InvalidGeometryError
+
+        super().__init__(wells)
+        self.z1 = z1
+        self.z2 = z2
+        self.z3 = z3
+        self.kinds = (kind1, kind2)
+
+    # --------------------------------------------------------------------------
+    def __repr__(self):
+        return 'StripBoundary({0.z1!r},{0.z2!r},{0.kinds[0]!r},{0.z3!r},' \
+               '{0.kinds[1]!r},{0.wells!r})'.format(self)
+
+    # --------------------------------------------------------------------------
+    def _frame(self, z):
+        """Rotate to the frame where the first boundary is the real axis.
+
+        Return the local locations, the unit direction e, the width d, and
+        the local well centers.
+        """
+        e = (self.z2 - self.z1) / abs(self.z2 - self.z1)
+        d = (numpy.conj(e) * (self.z3 - self.z1)).imag
+        zeta = numpy.conj(e) * (z - self.z1)
+        zw = numpy.array([numpy.conj(e) * (well.z - self.z1)
+                          for well in self.wells], dtype=complex)
+        return zeta, e, d, zw
+
+    # --------------------------------------------------------------------------
+    @staticmethod
+    def _logsin(x):
+        """log(sin(x)) without overflow for large |Im(x)|."""
+        upper = x.imag >= 0
+        t = numpy.exp(numpy.where(upper, 2j*x, -2j*x))
+        return numpy.where(upper,
+                           -1j*x + numpy.log((1 - t) / -2j),
+                           1j*x + numpy.log((1 - t) / 2j))
+
+    # --------------------------------------------------------------------------
+    @staticmethod
+    def _cot(x):
+        """cot(x) without overflow for large |Im(x)|."""
+        upper = x.imag >= 0
+        t = numpy.exp(numpy.where(upper, 2j*x, -2j*x))
+        return numpy.where(upper, -1j, 1j) * (1 + t) / (1 - t)
+
+    # --------------------------------------------------------------------------
+    def _rows(self, u, sigma, d):
+        """Row sum, and its derivative, of wells at u = 0 with period 2di."""
+        P = 2j*d
+        if sigma > 0:
+            x = cmath.pi*u/P
+            return self._logsin(x), cmath.pi/P * self._cot(x)
+        x = cmath.pi*u/(2*P)
+        y = x + cmath.pi/2
+        return (self._logsin(x) - self._logsin(y),
+                cmath.pi/(2*P) * (self._cot(x) - self._cot(y)))
+
+    # --------------------------------------------------------------------------
+    def _evaluate(self, z):
+        """Return Omega and dOmega/dz of the images at <z>."""
+        z = numpy.asarray(z)
+        ctype = numpy.result_type(z, numpy.complex64)
+        zeta, e, d, zw = self._frame(z)
+        s1, s2 = (_sign(kind) for kind in self.kinds)
+        sigma = s1*s2
+
+        Omega = numpy.zeros(z.shape, dtype=ctype)
+        dOmega = numpy.zeros(z.shape, dtype=ctype)
+        for well, c in zip(self.wells, zw):
+            # The translated row, less the well itself. Inside the well
+            # radius the row is evaluated at the radius, as in Well.
+            u = zeta - c
+            inside = numpy.abs(u) < well.r
+            u = numpy.where(inside, well.r, u)
+            F, dF = self._rows(u, sigma, d)
+            F = F - numpy.log(u)
+            dF = numpy.where(inside, numpy.nan, dF - 1/u)
+
+            # The reflected row.
+            G, dG = self._rows(zeta - numpy.conj(c), sigma, d)
+
+            Omega += well.Q/(2*cmath.pi) * (F + s1*G)
+            dOmega += well.Q/(2*cmath.pi) * (dF + s1*dG)
+        return Omega, dOmega * numpy.conj(e)
+
+    # --------------------------------------------------------------------------
+    def complex_potential(self, z):
+        """
+        StripBoundary's complex potential at location <z>.
+
+        Return the images' contribution to the complex potential,
+        Omega(z) [L^3/T], evaluated at location <z>.
+
+        Arguments:
+            z (complex or ndarray): 'little z' world coordinate location [L].
+
+        Returns:
+            complex or ndarray: complex potential at location <z> [L^3/T].
+
+        """
+        return self._evaluate(z)[0][()]
+
+    # --------------------------------------------------------------------------
+    def complex_discharge(self, z):
+        """
+        StripBoundary's complex discharge at location <z>.
+
+        Return the images' contribution to the complex discharge function,
+        W(z) [L^2/T], at location <z>.
+
+        Arguments:
+            z (complex or ndarray): 'little z' world coordinate location [L].
+
+        Returns:
+            complex or ndarray: complex discharge at location <z> [L^2/T].
+
+        """
+        return (-self._evaluate(z)[1])[()]
@@ -0,0 +1,269 @@
+"""<polygon_recharge.py> implements the PolygonRecharge class.
+
+This file is part of the Ginebig Project and is distributed under the
+BSD-3-Clause license. See the accompanying LICENSE.txt file.
+
+Copyright (c) 2017, Randal J. Barnes
+"""
+
+import copy
+import math
+import numpy
+
+from ginebig.analytic_element import AnalyticElement
+
+__version__ = '07 June 2017'
+
+
+# ------------------------------------------------------------------------------
+class Error(Exception):
+    """Base class for all exceptions raised by this module."""
+
+
+class InvalidVerticesError(Error):
+    """The polygon must have at least three vertices and a nonzero area."""
+
+
+# ------------------------------------------------------------------------------
+class PolygonRecharge(AnalyticElement):
+    """Uniform areal recharge over a simple polygonal region.
+
+    The recharge rate N [L/T] is the volume of water added to the aquifer per
+    unit area per unit time; a negative N represents an areal sink.
+
+    The discharge potential is the logarithmic potential of the polygon,
+
+        Phi(z) = -N/(2 pi) * integral_A ln|z - zeta| dA,
+
+    which the divergence theorem reduces to closed-form integrals along the
+    straight edges. Every edge is evaluated for all of the points at once, so
+    the cost is O(N*M) numpy work for N points and M edges.
+
+    All of the evaluation methods accept either a single complex location or
+    a numpy array of complex locations, and return a result of the same shape.
+    The precision of a complex64 array of locations is preserved.
+    """
+
+    # --------------------------------------------------------------------------
+    def __init__(self, vertices, N: float):
+        """
+        Intialize the attributes with minimal validation.
+
+        Arguments:
+           vertices (sequence of complex): vertices of a simple polygon, in
+               either clockwise or counterclockwise order, without repeating
+               the first vertex [L].
+           N (float): recharge rate [L/T].
+
+        Raises:
+            polygon_recharge.Error: Base class for all exceptions raised by
+                this module.
+            polygon_recharge.InvalidVerticesError: The polygon must have at
+                least three vertices and a nonzero area.
+        """
+        vertices = numpy.array(vertices, dtype=complex).ravel()
+        if vertices.size < 3:
+            raise InvalidVerticesError
+
+        area = 0.5 * numpy.sum(
+            numpy.imag(numpy.conj(vertices) * numpy.roll(vertices, -1)))
+        if abs(area) < numpy.finfo(float).eps:
+            raise InvalidVerticesError
+
+        # Store the vertices in counterclockwise order.
+        if area < 0:
+            vertices = vertices[::-1]
+
+        self.vertices = vertices
+        self.N = N
+        self.area = abs(area)
+
+    # --------------------------------------------------------------------------
+    def __repr__(self):
+        return 'PolygonRecharge({0!r},{1.N!r})'.format(
+            self.vertices.tolist(), self)
+
+    # --------------------------------------------------------------------------
+    def __str__(self):
+        return 'PolygonRecharge(vertices={0!s},N={1.N!s})'.format(
+            self.vertices.tolist(), self)
+
+    # --------------------------------------------------------------------------
+    def translated(self, dz: complex):
+        """
+        Return a copy of the polygon translated by <dz>.
+
+        Arguments:
+            dz (complex): translation [L].
+
+        Returns:
+            PolygonRecharge: the translated copy.
+
+        """
+        other = copy.copy(self)
+        other.vertices = self.vertices + dz
+        return other
+
+    # --------------------------------------------------------------------------
+    def _edges(self):
+        """Return the start vertex, unit tangent and length of each edge."""
+        za = self.vertices
+        e = numpy.roll(za, -1) - za
+        length = numpy.abs(e)
+        return za, e/length, length
+
+    # --------------------------------------------------------------------------
+    def inside(self, z):
+        """
+        Classify the location(s) <z> as inside the recharge polygon.
+
+        Arguments:
+            z (complex or ndarray): 'little z' world coordinate location [L].
+
+        Returns:
+            bool or ndarray: True where <z> is inside the polygon.
+
+        Notes:
+        -   The classification uses the crossing-number test, vectorized over
+            all of the points and looping only over the edges.
+
+        """
+        z = numpy.asarray(z, dtype=complex)
+        x, y = z.real, z.imag
+        result = numpy.zeros(z.shape, dtype=bool)
+
+        za = self.vertices
+        zb = numpy.roll(za, -1)
+        for a, b in zip(za, zb):
+            straddle = (a.imag > y) != (b.imag > y)
+            with numpy.errstate(divide='ignore', invalid='ignore'):
+                xc = a.real + (y - a.imag) * (b.real-a.real) / (b.imag-a.imag)
+            result ^= straddle & (x < xc)
+        return result[()]
+
+    # --------------------------------------------------------------------------
+    def _local(self, z):
+        """Edge-local coordinates (s1, s2, d) of the points <z>.
+
+        For each point and each edge, s1 and s2 are the signed distances along
+        the edge from the foot of the perpendicular through z to the start and
+        end vertices, and d is the signed distance from z to the edge line,
+        positive when z is on the inside of the edge. The returned arrays have
+        shape z.shape + (M,).
+        """
+        z = numpy.asarray(z)
+        ctype = numpy.result_type(z, numpy.complex64)
+        za, u, length = (a.astype(ctype) for a in self._edges())
+        length = length.real
+        zz = z[..., numpy.newaxis] - za
+        t = numpy.conj(u) * zz
+        s1 = -t.real
+        s2 = s1 + length
+        d = t.imag
+        return s1, s2, d, u
+
+    # --------------------------------------------------------------------------
+    @staticmethod
+    def _F(s, d):
+        """Antiderivative of ln(s^2 + d^2) with the removable limits at 0."""
+        rho2 = s**2 + d**2
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            a = numpy.where(rho2 > 0, s*numpy.log(rho2), 0.0)
+            b = numpy.where(d != 0, d*numpy.arctan(s/d), 0.0)
+        return a - 2*s + 2*b
+
+    # --------------------------------------------------------------------------
+    def complex_potential(self, z):
+        """
+        PolygonRecharge's complex potential at location <z>.
+
+        Return the recharge polygon's contribution to the complex potential,
+        Omega(z) [L^3/T], evaluated at location <z>.
+
+        Arguments:
+            z (complex or ndarray): 'little z' world coordinate location [L].
+
+        Returns:
+            complex or ndarray: complex potential at location <z> [L^3/T].
+
+        Notes:
+        -   Only the discharge potential is computed; the imaginary part of
+            the returned complex potential is NaN everywhere.
+
+        """
+        s1, s2, d, u = self._local(z)
+
+        # integral_A ln|z-zeta| dA = sum over edges of
+        #   (d/4) * [F(s) - s] from s1 to s2, since (zeta - z).n_out = d.
+        G = (self._F(s2, d) - s2) - (self._F(s1, d) - s1)
+        I = numpy.sum(0.25 * d * G, axis=-1)
+
+        Phi = -self.N / (2*math.pi) * I
+        return (Phi + complex(0, numpy.nan))[()]
+
+    # --------------------------------------------------------------------------
+    def complex_discharge(self, z):
+        """
+        PolygonRecharge's complex discharge at location <z>.
+
+        Return the recharge polygon's contribution to the complex discharge
+        function, W(z) [L^2/T], at location <z>.
+
+        Arguments:
+            z (complex or ndarray): 'little z' world coordinate location [L].
+
+        Returns:
+            complex or ndarray: complex discharge at location <z> [L^2/T].
+
+        """
+        s1, s2, d, u = self._local(z)
+
+        # grad_z integral_A ln|z-zeta| dA = -sum over edges of
+        #   n_out * [F(s)/2] from s1 to s2, with n_out = -i*u.
+        n_out = -1j * u
+        G = 0.5 * (self._F(s2, d) - self._F(s1, d))
+        gradI = -numpy.sum(n_out * G, axis=-1)
+
+        # (Qx + i Qy) = -grad Phi = N/(2 pi) grad I, and W = Qx - i Qy.
+        W = numpy.conj(self.N / (2*math.pi) * gradI)
+        return W[()]
+
+    # --------------------------------------------------------------------------
+    def abstraction(self):
+        """
+        PolygonRecharge's abstraction from the aquifer.
+
+        Returns:
+            float: abstraction from the aquifer [L^3/T].
+
+        Notes:
+        -   Recharge adds water to the aquifer, so the abstraction is the
+            negative of the total recharge, -N*area.
+
+        """
+        return -self.N * self.area
+
+    # --------------------------------------------------------------------------
+    def divergence_discharge(self, z):
+        """
+        PolygonRecharge's divergence of the discharge at location <z>.
+
+        Arguments:
+            z (complex or ndarray): 'little z' world coordinate location [L].
+
+        Returns:
+            float or ndarray: divergence of the discharge at location <z>
+                [L/T].
+
+        Notes:
+        -   The divergence of the discharge is N inside of the polygon, and 0
+            outside of the polygon.
+
+        """
+        return numpy.where(self.inside(z), float(self.N), float(0))[()]
+
+    # --------------------------------------------------------------------------
+    def solve(self, geo, root):
+        """
+        """
+        raise NotImplementedError('"solve" is not yet implemented.')
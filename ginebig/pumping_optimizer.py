@@ -0,0 +1,223 @@
+"""<pumping_optimizer.py> implements the PumpingOptimizer class.
+
+This file is part of the Ginebig Project and is distributed under the
+BSD-3-Clause license. See the accompanying LICENSE.txt file.
+
+Copyright (c) 2017, Randal J. Barnes
+"""
+
+import numpy
+import scipy.optimize
+
+from ginebig.reference_point import ReferencePoint
+
+__version__ = '07 June 2017'
+
+
+# ------------------------------------------------------------------------------
+class Error(Exception):
+    """Base class for all exceptions raised by this module."""
+
+
+class InvalidWellError(Error):
+    """The decision wells must be active elements of the model."""
+
+
+class InfeasibleError(Error):
+    """No pumping rates satisfy all of the constraints."""
+
+
+class UnboundedError(Error):
+    """The total pumping is not bounded by the constraints."""
+
+
+# ------------------------------------------------------------------------------
+class PumpingOptimizer(object):
+    """Maximize the total pumping from a well field subject to head limits.
+
+    The discharge potential is linear in the discharge of each well, so at
+    the control points
+
+        Phi = Phi_base + A Q,
+
+    where Q is the vector of decision-well discharges, Phi_base is the
+    potential from every other element, and A[i, j] is the potential at
+    control point i due to a unit discharge at well j. A[:, j] is the change
+    in the potential of the whole model when well j is switched from 0 to a
+    unit discharge, so elements that also depend on Q (e.g. the images of
+    an ImageBoundary) are included. When the model has a ReferencePoint the
+    constant of integration also depends on Q; that dependence is folded
+    into A, so the relation stays exact.
+
+    Head limits are converted into Phi limits through Geology.head2Phi, which
+    is monotone, so the nonlinear head constraints become linear Phi
+    constraints. The response matrix and Phi_base are built once, from one
+    model evaluation per decision well, and cached; scipy.optimize.linprog
+    then works on the matrix alone.
+    """
+
+    # --------------------------------------------------------------------------
+    def __init__(self, model, wells, Qmin: float = 0, Qmax: float = None):
+        """Initialize the PumpingOptimizer class.
+
+        Arguments:
+            model (Model): the solved model containing the wells.
+            wells (sequence of Well): the decision wells.
+            Qmin (float): lower bound on each well discharge [L^3/T].
+            Qmax (float): upper bound on each well discharge [L^3/T], or
+                None for no upper bound.
+
+        Raises:
+            InvalidWellError: The decision wells must be active elements of
+                the model.
+        """
+        active = model.active_elements()
+        if not all(any(w is e for e in active) for w in wells):
+            raise InvalidWellError
+
+        self.model = model
+        self.wells = list(wells)
+        self.Qmin = Qmin
+        self.Qmax = Qmax
+
+        self.points = []
+        self.head_min = []
+        self.drawdown_max = []
+
+        self._response = None
+        self._base = None
+
+    # --------------------------------------------------------------------------
+    def add_head_constraint(self, z: complex, head_min: float):
+        """Require the head at location <z> to be at least <head_min> [L]."""
+        self.points.append(z)
+        self.head_min.append(head_min)
+        self.drawdown_max.append(numpy.inf)
+        self._response = None
+
+    # --------------------------------------------------------------------------
+    def add_drawdown_constraint(self, z: complex, drawdown_max: float):
+        """Limit the drawdown at location <z> to <drawdown_max> [L].
+
+        The drawdown is measured from the ambient head, with every decision
+        well turned off.
+        """
+        self.points.append(z)
+        self.head_min.append(-numpy.inf)
+        self.drawdown_max.append(drawdown_max)
+        self._response = None
+
+    # --------------------------------------------------------------------------
+    def response_matrix(self):
+        """Return the cached (npoints, nwells) unit response matrix."""
+        if self._response is None:
+            self._build()
+        return self._response
+
+    # --------------------------------------------------------------------------
+    def _build(self):
+        """Build the unit response matrix and the base potential."""
+        z = numpy.array(self.points, dtype=complex)
+
+        # Include the reference point, if any, as an extra row.
+        reference = [e for e in self.model.active_elements()
+                     if isinstance(e, ReferencePoint)]
+        if reference:
+            z = numpy.append(z, reference[0].z)
+
+        # Each column is a unit perturbation of the whole model, so that any
+        # other element that depends on a well's Q (e.g. the images of an
+        # ImageBoundary) is included.
+        Q = [well.Q for well in self.wells]
+        A = numpy.empty((z.size, len(self.wells)))
+        try:
+            for well in self.wells:
+                well.Q = 0.0
+            Phi0 = self.model.complex_potential(z).real
+            for j, well in enumerate(self.wells):
+                well.Q = 1.0
+                A[:, j] = self.model.complex_potential(z).real - Phi0
+                well.Q = 0.0
+        finally:
+            for well, q in zip(self.wells, Q):
+                well.Q = q
+
+        if reference:
+            A = A[:-1] - A[-1]
+            z = z[:-1]
+
+        Q = numpy.array(Q, dtype=float)
+        self.model.solve()
+        Phi = self.model.complex_potential(z).real
+
+        self._response = A
+        self._base = Phi - A @ Q
+
+    # --------------------------------------------------------------------------
+    def ambient_heads(self):
+        """Return the heads at the control points with the wells off [L]."""
+        self.response_matrix()
+        return self.model.geo.Phi2head(self._base, 0)
+
+    # --------------------------------------------------------------------------
+    def heads(self, Q):
+        """Return the heads at the control points for the discharges <Q> [L].
+
+        This uses the cached response matrix; no element is re-evaluated.
+        """
+        A = self.response_matrix()
+        return self.model.geo.Phi2head(self._base + A @ numpy.asarray(Q), 0)
+
+    # --------------------------------------------------------------------------
+    def solve(self, apply: bool = False):
+        """
+        Maximize the total discharge of the decision wells.
+
+        Arguments:
+            apply (bool): if True, set each well's Q to the optimal discharge
+                and re-solve the model.
+
+        Returns:
+            ndarray: the optimal discharge of each decision well [L^3/T].
+
+        Raises:
+            InfeasibleError: No pumping rates satisfy all of the constraints.
+            UnboundedError: The total pumping is not bounded by the
+                constraints.
+        """
+        A = self.response_matrix()
+        geo = self.model.geo
+
+        # Convert the head and drawdown limits into Phi limits.
+        ambient = self.ambient_heads() if self.points else numpy.empty(0)
+        hmin = numpy.maximum(numpy.array(self.head_min, dtype=float),
+                             ambient - numpy.array(self.drawdown_max))
+        bounded = numpy.isfinite(hmin)
+
+        # A head at or below the base only requires a saturated aquifer.
+        b = geo.properties(0)[3]
+        Phi_min = numpy.zeros(numpy.count_nonzero(bounded))
+        wet = hmin[bounded] > b
+        Phi_min[wet] = geo.head2Phi(hmin[bounded][wet], 0)
+
+        # Phi_base + A Q >= Phi_min  <=>  -A Q <= Phi_base - Phi_min.
+        result = scipy.optimize.linprog(
+            c=-numpy.ones(len(self.wells)),
+            A_ub=-A[bounded] if bounded.any() else None,
+            b_ub=(self._base[bounded] - Phi_min) if bounded.any() else None,
+            bounds=[(self.Qmin, self.Qmax)] * len(self.wells),
+            method='highs')
+
+        if result.status == 2:
+            raise InfeasibleError(result.message)
+        if result.status == 3:
+            raise UnboundedError(result.message)
+        if result.status != 0:
+            raise Error(result.message)
+
+        Q = result.x
+        if apply:
+            for well, q in zip(self.wells, Q):
+                well.Q = float(q)
+            self.model.solve()
+        return Q
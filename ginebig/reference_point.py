@@ -6,6 +6,8 @@ BSD-3-Clause license. See the accompanying LICENSE.txt file.
 Copyright (c) 2017, Randal J. Barnes
 """
 
+import numpy
+
 from ginebig.analytic_element import AnalyticElement
 
 __version__ = '07 June 2017'
@@ -39,7 +41,7 @@ class ReferencePoint(AnalyticElement):
 
     # --------------------------------------------------------------------------
     def __str__(self):
-        return 'ReferencePoint(z={0.z!s},head={0.Q!s})'.format(self)
+        return 'ReferencePoint(z={0.z!s},head={0.head!s})'.format(self)
 
     # --------------------------------------------------------------------------
     def complex_potential(self, z: complex) -> complex:
@@ -50,13 +52,14 @@ class ReferencePoint(AnalyticElement):
         Omega(z) [L^3/T], evaluated at location <z>.
 
         Arguments:
-            z (complex): 'little z' world coordinate location [L].
+            z (complex or ndarray): 'little z' world coordinate location [L].
 
         Returns:
-            complex: complex potential at location <z> [L^3/T].
+            complex or ndarray: complex potential at location <z> [L^3/T].
 
         """
-        return complex(0, 0)
+        z = numpy.asarray(z)
+        return numpy.zeros(z.shape, dtype=numpy.result_type(z, 1j))[()]
 
     # --------------------------------------------------------------------------
     def complex_discharge(self, z: complex) -> complex:
@@ -67,13 +70,14 @@ class ReferencePoint(AnalyticElement):
         function, W(z) [L^2/T], at location <z>.
 
         Arguments:
-            z (complex): 'little z' world coordinate location [L].
+            z (complex or ndarray): 'little z' world coordinate location [L].
 
         Returns:
-            complex: complex discharge at location <z> [L^2/T].
+            complex or ndarray: complex discharge at location <z> [L^2/T].
 
         """
-        return complex(0, 0)
+        z = numpy.asarray(z)
+        return numpy.zeros(z.shape, dtype=numpy.result_type(z, 1j))[()]
 
     # --------------------------------------------------------------------------
     def abstraction(self):
@@ -96,13 +100,14 @@ class ReferencePoint(AnalyticElement):
         ReferencePoint's divergence of the discharge at location <z>.
 
         Arguments:
-            z (complex): 'little z' world coordinate location [L].
+            z (complex or ndarray): 'little z' world coordinate location [L].
 
         Returns:
-            float: divergence of the discharge at location <z> [L/T].
+            float or ndarray: divergence of the discharge at location <z>
+                [L/T].
 
         """
-        return float(0)
+        return numpy.zeros(numpy.shape(z))[()]
 
     # --------------------------------------------------------------------------
     def solve(self, geo, root):
@@ -0,0 +1,185 @@
+"""<result_cache.py> implements the ResultCache class.
+
+This file is part of the Ginebig Project and is distributed under the
+BSD-3-Clause license. See the accompanying LICENSE.txt file.
+
+Copyright (c) 2017, Randal J. Barnes
+"""
+
+import hashlib
+import os
+import tempfile
+
+import numpy
+
+__version__ = '07 June 2017'
+
+
+# ------------------------------------------------------------------------------
+class Error(Exception):
+    """Base class for all exceptions raised by this module."""
+
+
+class InvalidCapacityError(Error):
+    """The cache capacity must be strictly positive."""
+
+
+# ------------------------------------------------------------------------------
+class ResultCache(object):
+    """A persistent, content-addressed cache of model results.
+
+    Results are keyed by a SHA-256 hash of the canonical model definition --
+    the repr() and activity of every element, the repr() of the Geology --
+    together with a description of the query (e.g. the grid extents). The
+    same model built in another session or pipeline stage hashes to the same
+    key, so its results are found on disk instead of being recomputed.
+
+    Each result is stored as <directory>/<key>.npy and returned as a
+    read-only memory map. The total size of the cache is capped at
+    <capacity> bytes; the least recently used results are evicted first.
+    Files are written atomically, so concurrent readers never see a partial
+    result, and evicting or invalidating a result that another process is
+    reading is harmless.
+
+    Notes:
+    -   The <salt> is mixed into every key. Change it to invalidate all
+        existing results at once, e.g. after changing an element's
+        formulation.
+    """
+
+    # --------------------------------------------------------------------------
+    def __init__(self, directory: str, capacity: int = 2**30,
+                 salt: str = __version__):
+        """Initialize the ResultCache class.
+
+        Arguments:
+            directory (str): directory holding the cached results.
+            capacity (int): maximum total size of the cached results [bytes].
+            salt (str): string mixed into every key.
+
+        Raises:
+            InvalidCapacityError: The cache capacity must be strictly
+                positive.
+        """
+        if capacity <= 0:
+            raise InvalidCapacityError
+
+        self.directory = directory
+        self.capacity = capacity
+        self.salt = salt
+        os.makedirs(directory, exist_ok=True)
+
+    # --------------------------------------------------------------------------
+    def __repr__(self):
+        return 'ResultCache({0.directory!r},{0.capacity!r},{0.salt!r})'.format(
+            self)
+
+    # --------------------------------------------------------------------------
+    def key(self, model, *query) -> str:
+        """Return the hex key for the <model> and the <query> description."""
+        parts = [self.salt, repr(model.geo)]
+        parts += ['{0!r}:{1}'.format(e, e.isactive()) for e in model.elements]
+        parts += [repr(q) for q in query]
+        return hashlib.sha256('\n'.join(parts).encode('utf-8')).hexdigest()
+
+    # --------------------------------------------------------------------------
+    def path(self, key: str) -> str:
+        """Return the file name of the result with the <key>."""
+        return os.path.join(self.directory, key + '.npy')
+
+    # --------------------------------------------------------------------------
+    def get(self, key: str):
+        """Return the cached result as a read-only memory map, or None."""
+        path = self.path(key)
+        try:
+            result = numpy.load(path, mmap_mode='r')
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return result
+
+    # --------------------------------------------------------------------------
+    def put(self, key: str, result):
+        """Store the <result> array under the <key> and enforce the cap."""
+        fd, tmp = tempfile.mkstemp(suffix='.tmp', dir=self.directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                numpy.save(f, numpy.asarray(result))
+            os.replace(tmp, self.path(key))
+        except BaseException:
+            os.remove(tmp)
+            raise
+        self.evict(keep=key)
+
+    # --------------------------------------------------------------------------
+    def invalidate(self, key: str):
+        """Remove the result with the <key>, if it is cached."""
+        try:
+            os.remove(self.path(key))
+        except FileNotFoundError:
+            pass
+
+    # --------------------------------------------------------------------------
+    def clear(self):
+        """Remove every cached result."""
+        for key, size, atime in self._entries():
+            self.invalidate(key)
+
+    # --------------------------------------------------------------------------
+    def size(self) -> int:
+        """Return the total size of the cached results [bytes]."""
+        return sum(size for key, size, atime in self._entries())
+
+    # --------------------------------------------------------------------------
+    def _entries(self):
+        """Return a list of (key, size, last use) for the cached results."""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith('.npy'):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((entry.name[:-4], stat.st_size, stat.st_mtime))
+        return entries
+
+    # --------------------------------------------------------------------------
+    def evict(self, keep: str = None):
+        """Evict least recently used results until the cap is respected."""
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        total = sum(size for key, size, atime in entries)
+        for key, size, atime in entries:
+            if total <= self.capacity:
+                break
+            if key == keep:
+                continue
+            self.invalidate(key)
+            total -= size
+
+    # --------------------------------------------------------------------------
+    def solve(self, model):
+        """Solve the <model>, reusing a cached solution if there is one."""
+        key = self.key(model, 'solve')
+        result = self.get(key)
+        if result is None:
+            model.solve()
+            self.put(key, numpy.array([model.constant]))
+        else:
+            model.constant = float(result[0])
+
+    # --------------------------------------------------------------------------
+    def head_grid(self, model, xmin: float, xmax: float, ymin: float,
+                  ymax: float, nx: int, ny: int, precision='double'):
+        """Return Model.head_grid for the arguments, from the cache if possible.
+
+        The model must already be solved; the constant of integration is
+        part of the key.
+        """
+        key = self.key(model, 'head_grid', model.constant,
+                       xmin, xmax, ymin, ymax, nx, ny, precision)
+        result = self.get(key)
+        if result is None:
+            result = model.head_grid(xmin, xmax, ymin, ymax, nx, ny, precision)
+            self.put(key, result)
+        return result
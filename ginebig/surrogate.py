@@ -0,0 +1,489 @@
+"""<surrogate.py> implements the FarFieldSurrogate class.
+
+This file is part of the Ginebig Project and is distributed under the
+BSD-3-Clause license. See the accompanying LICENSE.txt file.
+
+Copyright (c) 2017, Randal J. Barnes
+"""
+
+import copy
+import math
+
+import numpy
+
+from ginebig.circular_recharge import CircularRecharge
+from ginebig.polygon_recharge import PolygonRecharge
+from ginebig.uniform_flow import UniformFlow
+from ginebig.well import Well
+from ginebig.well_index import WellIndex
+
+__version__ = '07 June 2017'
+
+
+# ------------------------------------------------------------------------------
+class Error(Exception):
+    """Base class for all exceptions raised by this module."""
+
+
+class InvalidPartitionError(Error):
+    """The partition must have a positive extent and at least one cell."""
+
+
+# ------------------------------------------------------------------------------
+def extent(element):
+    """Return the (center, radius) of an element's non-smooth region.
+
+    Returns None for an element that is smooth everywhere (UniformFlow), and
+    (center, inf) for an element whose extent is unknown, so that it is
+    always evaluated exactly.
+    """
+    if isinstance(element, UniformFlow):
+        return None
+    if isinstance(element, Well):
+        return element.z, element.r
+    if isinstance(element, CircularRecharge):
+        return element.z, element.R
+    if isinstance(element, PolygonRecharge):
+        center = element.vertices.mean()
+        return center, numpy.abs(element.vertices - center).max()
+    return complex(0, 0), math.inf
+
+
+def _signature(element):
+    """Return a value that changes whenever the <element> changes.
+
+    This is the repr() of the element; for the common case of a Well the
+    cheaper (z, Q, r) tuple is used instead.
+    """
+    if isinstance(element, Well):
+        return element.z, element.Q, element.r
+    return repr(element)
+
+
+def _tensor(x, y):
+    """Return the (len(y), len(x)) complex array of locations x + iy."""
+    return x[numpy.newaxis, :] + 1j*y[:, numpy.newaxis]
+
+
+def _well_field(zz, Q, r, discharge):
+    """Phi, or W if <discharge>, of wells at their local locations <zz>.
+
+    This is Well.complex_potential().real, or Well.complex_discharge(), for
+    wells of discharges <Q> and radii <r>, broadcast over all of the
+    (location, well) pairs at once.
+    """
+    rho = numpy.abs(zz)
+    if discharge:
+        with numpy.errstate(invalid='ignore', divide='ignore'):
+            return numpy.where(rho < r, math.nan, -Q/(2*math.pi) / zz)
+    return Q/(2*math.pi) * numpy.log(numpy.maximum(rho, r))
+
+
+def _pack(elements):
+    """Return the (is_well, centers, discharges, radii) arrays of <elements>.
+
+    The entries of the elements that are not wells are placeholders.
+    """
+    wells = [e if isinstance(e, Well) else None for e in elements]
+    is_well = numpy.array([w is not None for w in wells], dtype=bool)
+    zw = numpy.array([w.z if w else 0 for w in wells], dtype=complex)
+    Q = numpy.array([w.Q if w else 0 for w in wells], dtype=float)
+    r = numpy.array([w.r if w else 1 for w in wells], dtype=float)
+    return is_well, zw, Q, r
+
+
+def _exact(elements, z, discharge):
+    """Sum of the exact Phi, or of W if <discharge>, of <elements> at <z>."""
+    total = numpy.zeros(z.shape, dtype=complex if discharge else float)
+    for element in elements:
+        if discharge:
+            total += element.complex_discharge(z)
+        else:
+            total += element.complex_potential(z).real
+    return total
+
+
+def _chebyshev(x, p):
+    """Return the (len(x), p) matrix of T_0..T_{p-1} at <x> in [-1, 1]."""
+    T = numpy.empty((x.size, p))
+    T[:, 0] = 1
+    if p > 1:
+        T[:, 1] = x
+    for k in range(2, p):
+        T[:, k] = 2*x*T[:, k-1] - T[:, k-2]
+    return T
+
+
+# ------------------------------------------------------------------------------
+class FarFieldSurrogate(object):
+    """Piecewise Chebyshev surrogate of the smooth far field of a model.
+
+    The rectangle [xmin, xmax] x [ymin, ymax] is partitioned into nx by ny
+    cells. For each cell, an element is in the far field if its non-smooth
+    region (e.g. the well screen, or the recharge area) is farther than
+    <separation> cell half-diagonals from the cell center; UniformFlow is
+    always in the far field. The summed far-field discharge potential Phi
+    and complex discharge W are fit by tensor Chebyshev interpolants of
+    order 8, 16 or 32 -- the lowest that meets the tolerance on an
+    interleaved check grid. A cell that fails at every order is evaluated
+    exactly.
+
+    A query costs one interpolant evaluation plus the exact contributions of
+    the cell's near-field elements and the model constant. The near-field
+    lists of the cells are kept by update(), so a query never visits the
+    far elements; the interpolants, and the near-field wells, are evaluated
+    for all of the locations of a batch at once. Only the requested
+    quantity, Phi or W, is computed. Locations outside of the partition are
+    evaluated exactly.
+
+    The surrogate tracks the model: update() compares each element's
+    parameters (its repr(), or z, Q and r for a Well) and activity with
+    those seen at the last update. A fit keeps a snapshot of the far
+    elements it was fit to, and while only a few of them differ from the
+    model, the fit is kept and corrected exactly: the snapshots of the
+    changed elements are subtracted, and their current versions added, as
+    if they were in the near field. Once more than DELTAS of them differ,
+    the fit is discarded. Cells are fit lazily, the first time a query
+    lands in them. Evaluation calls update() automatically.
+
+    Notes:
+    -   The stream function is not fit; the branch cuts of the far wells
+        make it discontinuous within cells.
+    -   The tolerance <tol> applies to Phi [L^3/T]; the tolerance on W is
+        <tol> divided by the cell half-width [L^2/T].
+    """
+
+    ORDERS = (8, 16, 32)
+    BLOCK = 1024
+    DELTAS = 32
+
+    # --------------------------------------------------------------------------
+    def __init__(self, model, xmin: float, xmax: float, ymin: float,
+                 ymax: float, nx: int, ny: int, tol: float = 1e-6,
+                 separation: float = 2.0):
+        """Initialize the FarFieldSurrogate class.
+
+        Arguments:
+            model (Model): the model to accelerate.
+            xmin, xmax (float): range of the partition x coordinates [L].
+            ymin, ymax (float): range of the partition y coordinates [L].
+            nx, ny (int): number of cell columns and rows.
+            tol (float): tolerance on the far-field Phi [L^3/T].
+            separation (float): near-field radius, in cell half-diagonals.
+
+        Raises:
+            InvalidPartitionError: The partition must have a positive extent
+                and at least one cell.
+        """
+        if not (xmax > xmin and ymax > ymin and nx >= 1 and ny >= 1):
+            raise InvalidPartitionError
+
+        self.model = model
+        self.xmin = xmin
+        self.xmax = xmax
+        self.ymin = ymin
+        self.ymax = ymax
+        self.nx = nx
+        self.ny = ny
+        self.tol = tol
+        self.separation = separation
+
+        self.dx = (xmax - xmin) / nx
+        self.dy = (ymax - ymin) / ny
+
+        self._signatures = {}
+        self._snapshots = {}
+        self._elements = []
+        self._terms = []
+        self._signs = numpy.empty(0)
+        self._wells = _pack([])
+        self._far = {cell: numpy.empty(0, dtype=numpy.intp)
+                     for cell in numpy.ndindex(ny, nx)}
+        self._near = (numpy.zeros(nx*ny + 1, dtype=numpy.intp),
+                      numpy.empty(0, dtype=numpy.intp))
+        self._fits = {}
+        self.nfits = 0
+
+    # --------------------------------------------------------------------------
+    def _centers(self):
+        """Return the (ny, nx) complex array of cell centers."""
+        x = self.xmin + (numpy.arange(self.nx) + 0.5)*self.dx
+        y = self.ymin + (numpy.arange(self.ny) + 0.5)*self.dy
+        return _tensor(x, y)
+
+    # --------------------------------------------------------------------------
+    def update(self):
+        """
+        Synchronize with the model, correcting or discarding the fits.
+
+        Returns:
+            int: the number of cells whose fits were discarded.
+        """
+        elements = self.model.active_elements()
+        signatures = {id(e): _signature(e) for e in elements}
+        if signatures == self._signatures:
+            return 0
+        changed = {key for key in set(signatures) | set(self._signatures)
+                   if signatures.get(key) != self._signatures.get(key)}
+
+        # A snapshot of each element as it is now, for the fits to come.
+        snapshots = {}
+        for element in elements:
+            key = id(element)
+            if key in changed or key not in self._snapshots:
+                snapshots[key] = signatures[key], copy.deepcopy(element)
+            else:
+                snapshots[key] = self._snapshots[key]
+
+        centers = self._centers()
+        reach = self.separation * 0.5*math.hypot(self.dx, self.dy)
+        far = numpy.zeros((len(elements),) + centers.shape, dtype=bool)
+        rows = []
+        for k, element in enumerate(elements):
+            if isinstance(element, Well):
+                rows.append(k)
+                far[k] = True
+                continue
+            ext = extent(element)
+            if ext is None:
+                far[k] = True
+            else:
+                far[k] = numpy.abs(centers - ext[0]) - ext[1] > reach
+
+        # The wells near each cell come from the index, not a dense pass.
+        if rows:
+            index = WellIndex([elements[k] for k in rows])
+            points, near = index.pairs(centers, reach)
+            rows = numpy.array(rows, dtype=numpy.intp)
+            far.reshape(len(elements), -1)[rows[near], points] = False
+
+        # The terms evaluated exactly in the fitted cells: the elements, and
+        # the out-of-date snapshots, which are subtracted.
+        terms = list(elements)
+        stale = {}
+
+        # The far elements of each cell, as indices into the elements, and
+        # the exact terms of each cell: its near elements, plus the
+        # corrections of its fit.
+        rows = []
+        discarded = 0
+        near = ~far.reshape(len(elements), centers.size)
+        for c, cell in enumerate(numpy.ndindex(centers.shape)):
+            old = {id(self._elements[k]) for k in self._far[cell]}
+            self._far[cell] = numpy.flatnonzero(~near[:, c])
+            rows.append(numpy.flatnonzero(near[:, c]))
+
+            if cell not in self._fits:
+                continue
+            fit = self._fits[cell]
+            current = {id(elements[k]): k for k in self._far[cell]}
+            if fit is None:
+                if old != set(current) or set(current) & changed:
+                    del self._fits[cell]
+                continue
+
+            basis = fit[2]
+            add = [k for key, k in current.items()
+                   if key not in basis or basis[key][0] != signatures[key]]
+            drop = [entry for key, entry in basis.items()
+                    if key not in current or entry[0] != signatures[key]]
+            if len(add) + len(drop) > self.DELTAS:
+                del self._fits[cell]
+                discarded += 1
+                continue
+
+            for signature, snapshot in drop:
+                if id(snapshot) not in stale:
+                    stale[id(snapshot)] = len(terms)
+                    terms.append(snapshot)
+                add.append(stale[id(snapshot)])
+            rows[-1] = numpy.append(rows[-1], add).astype(numpy.intp)
+
+        # The exact terms of the cells, as compressed rows: the indices into
+        # self._terms of the terms of flat cell c are index[ptr[c]:ptr[c+1]].
+        ptr = numpy.zeros(centers.size + 1, dtype=numpy.intp)
+        numpy.cumsum([len(row) for row in rows], out=ptr[1:])
+        self._near = ptr, numpy.concatenate(rows + [ptr[:0]])
+
+        self._signatures = signatures
+        self._snapshots = snapshots
+        self._elements = elements
+        self._terms = terms
+        self._signs = numpy.where(numpy.arange(len(terms)) < len(elements),
+                                  1.0, -1.0)
+        self._wells = _pack(terms)
+        self._wells[2][:] *= self._signs
+        return discarded
+
+    # --------------------------------------------------------------------------
+    def _cell_frame(self, cell):
+        """Return the center and half-widths of the <cell> = (row, col)."""
+        j, i = cell
+        cx = self.xmin + (i + 0.5)*self.dx
+        cy = self.ymin + (j + 0.5)*self.dy
+        return cx, cy, 0.5*self.dx, 0.5*self.dy
+
+    # --------------------------------------------------------------------------
+    def _sum(self, ks, z, discharge):
+        """Exact Phi, or W if <discharge>, of self._elements[ks] at <z>."""
+        is_well, zw, Q, r = self._wells
+        kw = ks[is_well[ks]]
+        total = _well_field(z[..., numpy.newaxis] - zw[kw], Q[kw], r[kw],
+                            discharge).sum(axis=-1)
+        return total + _exact([self._elements[k] for k in ks[~is_well[ks]]],
+                              z, discharge)
+
+    # --------------------------------------------------------------------------
+    def _far_field(self, cell, z):
+        """Exact far-field Phi and W of the <cell> at the locations <z>."""
+        far = self._far[cell]
+        return self._sum(far, z, False), self._sum(far, z, True)
+
+    # --------------------------------------------------------------------------
+    def _fit(self, cell):
+        """Fit the far field of the <cell>, or None to evaluate it exactly."""
+        cx, cy, hx, hy = self._cell_frame(cell)
+        self.nfits += 1
+
+        for p in self.ORDERS:
+            x = numpy.cos(math.pi*(numpy.arange(p) + 0.5)/p)
+            z = _tensor(cx + hx*x, cy + hy*x)
+            Phi, W = self._far_field(cell, z)
+
+            Tinv = numpy.linalg.inv(_chebyshev(x, p))
+            C_Phi = Tinv @ Phi @ Tinv.T
+            C_W = Tinv @ W @ Tinv.T
+
+            # Check on the interleaved Chebyshev extrema.
+            s = numpy.cos(math.pi*numpy.arange(1, p)/p)
+            zc = _tensor(cx + hx*s, cy + hy*s)
+            Phi_true, W_true = self._far_field(cell, zc)
+            T = _chebyshev(s, p)
+            Phi_err = numpy.abs(T @ C_Phi @ T.T - Phi_true).max()
+            W_err = numpy.abs(T @ C_W @ T.T - W_true).max()
+
+            if Phi_err <= self.tol and W_err <= self.tol/min(hx, hy):
+                basis = {id(self._elements[k]):
+                         self._snapshots[id(self._elements[k])]
+                         for k in self._far[cell]}
+                return C_Phi, C_W, basis
+        return None
+
+    # --------------------------------------------------------------------------
+    def _near_pairs(self, keys):
+        """Return the near-field (position, term) pairs of <keys>.
+
+        Each position into the flat cell indices <keys> is paired with the
+        index into self._terms of each exact term of its cell.
+        """
+        ptr, index = self._near
+        counts = ptr[keys + 1] - ptr[keys]
+        positions = numpy.repeat(numpy.arange(keys.size), counts)
+        first = numpy.repeat(ptr[keys] - numpy.cumsum(counts) + counts, counts)
+        return positions, index[first + numpy.arange(positions.size)]
+
+    # --------------------------------------------------------------------------
+    def _evaluate(self, z, discharge):
+        """Return Phi, or W if <discharge>, of the model at <z>."""
+        self.update()
+
+        z = numpy.asarray(z, dtype=complex)
+        zf = z.ravel()
+        if discharge:
+            result = numpy.zeros(zf.shape, dtype=complex)
+        else:
+            result = numpy.full(zf.shape, float(self.model.constant))
+
+        i = numpy.floor((zf.real - self.xmin) / self.dx)
+        j = numpy.floor((zf.imag - self.ymin) / self.dy)
+        inside = (i >= 0) & (i < self.nx) & (j >= 0) & (j < self.ny)
+        key = numpy.where(inside, j*self.nx + i, -1).astype(numpy.intp)
+
+        # The fits of the queried cells; a cell is fit the first time.
+        cells, inverse = numpy.unique(key, return_inverse=True)
+        fits = []
+        for flat in cells:
+            cell = divmod(int(flat), self.nx)
+            if flat >= 0 and cell not in self._fits:
+                self._fits[cell] = self._fit(cell)
+            fits.append(self._fits[cell] if flat >= 0 else None)
+        orders = numpy.array([0 if fit is None else fit[0].shape[0]
+                              for fit in fits], dtype=int)[inverse]
+
+        # Locations outside of the partition, or in cells without a fit,
+        # are evaluated exactly.
+        exact = numpy.flatnonzero(orders == 0)
+        if exact.size:
+            result[exact] += _exact(self._elements, zf[exact], discharge)
+
+        # The interpolants, gathered for blocks of locations.
+        for p in self.ORDERS:
+            points = numpy.flatnonzero(orders == p)
+            if points.size == 0:
+                continue
+            used, local = numpy.unique(inverse[points], return_inverse=True)
+            C = numpy.stack([fits[k][1 if discharge else 0] for k in used])
+            for lo in range(0, points.size, self.BLOCK):
+                block = points[lo:lo + self.BLOCK]
+                row, col = numpy.divmod(key[block], self.nx)
+                x = 2*(zf[block].real - self.xmin)/self.dx - (2*col + 1)
+                y = 2*(zf[block].imag - self.ymin)/self.dy - (2*row + 1)
+                result[block] += numpy.einsum(
+                    'nj,nji,ni->n', _chebyshev(y, p),
+                    C[local[lo:lo + self.BLOCK]], _chebyshev(x, p))
+
+        # The exact terms of the fitted cells: the wells in one pass over
+        # the (location, well) pairs, and the other terms one at a time.
+        points = numpy.flatnonzero(orders > 0)
+        positions, near = self._near_pairs(key[points])
+        block = points[positions]
+        is_well, zw, Q, r = self._wells
+        w = is_well[near]
+        kw = near[w]
+        numpy.add.at(result, block[w], _well_field(
+            zf[block[w]] - zw[kw], Q[kw], r[kw], discharge))
+        for k in numpy.unique(near[~w]):
+            members = block[~w][near[~w] == k]
+            result[members] += self._signs[k] * _exact(
+                [self._terms[k]], zf[members], discharge)
+
+        return result.reshape(z.shape)
+
+    # --------------------------------------------------------------------------
+    def discharge_potential(self, z):
+        """
+        Surrogate discharge potential at location <z>.
+
+        Arguments:
+            z (complex or ndarray): 'little z' world coordinate location [L].
+
+        Returns:
+            float or ndarray: discharge potential at location <z> [L^3/T].
+        """
+        return self._evaluate(z, False)[()]
+
+    # --------------------------------------------------------------------------
+    def complex_discharge(self, z):
+        """
+        Surrogate complex discharge at location <z>.
+
+        Arguments:
+            z (complex or ndarray): 'little z' world coordinate location [L].
+
+        Returns:
+            complex or ndarray: complex discharge at location <z> [L^2/T].
+        """
+        return self._evaluate(z, True)[()]
+
+    # --------------------------------------------------------------------------
+    def head(self, z):
+        """
+        Surrogate head at location <z>.
+
+        Arguments:
+            z (complex or ndarray): 'little z' world coordinate location [L].
+
+        Returns:
+            float or ndarray: head at location <z> [L].
+        """
+        return self.model.geo.Phi2head(self.discharge_potential(z), 0)
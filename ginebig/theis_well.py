@@ -0,0 +1,176 @@
+"""<theis_well.py> implements the TheisWell class.
+
+This file is part of the Ginebig Project and is distributed under the
+BSD-3-Clause license. See the accompanying LICENSE.txt file.
+
+Copyright (c) 2017, Randal J. Barnes
+"""
+
+import numpy
+import scipy.special
+
+__version__ = '07 June 2017'
+
+
+# ------------------------------------------------------------------------------
+class Error(Exception):
+    """Base class for all exceptions raised by this module."""
+
+
+class InvalidRadiusError(Error):
+    """The specified well radius was not strictly positive."""
+
+
+class InvalidScheduleError(Error):
+    """The pumping schedule must be non-empty with increasing start times."""
+
+
+# ------------------------------------------------------------------------------
+class TheisWell(object):
+    """A transient well in an infinite aquifer: the Theis solution.
+
+    The well starts from rest and follows a stepped pumping schedule. The
+    schedule is a sequence of (start time, discharge) pairs; each discharge
+    holds until the next start time. The response is the superposition in
+    time of one Theis well per change in the discharge,
+
+        Phi(t, z) = -sum_i (Q_i - Q_{i-1})/(4 pi) * E1(u_i),
+        u_i = |z - zw|^2 S / (4 T (t - t_i)),
+
+    where E1 is the exponential integral, T the transmissivity and S the
+    storativity served by the Geology. Terms with t <= t_i are zero.
+
+    The TheisWell is not an AnalyticElement: its contribution depends on time
+    and on the Geology, so it is evaluated through its own methods. Every
+    evaluation method broadcasts a 1-D array of times against an array of
+    locations of any shape and returns an array of shape t.shape + z.shape,
+    computed in a single scipy.special.exp1 call.
+
+    Notes:
+    -   The Theis solution is linear in the discharge potential. Converting
+        the change in Phi to a drawdown by dividing by the transmissivity is
+        exact for a confined aquifer, and is the usual approximation for an
+        unconfined aquifer with small drawdowns.
+    """
+
+    # --------------------------------------------------------------------------
+    def __init__(self, z: complex, schedule, r: float):
+        """
+        Intialize the attributes with minimal validation.
+
+        Arguments:
+           z (complex): center of the well [L].
+           schedule (sequence of (float, float)): the (start time [T],
+               discharge [L^3/T]) pairs of the stepped pumping schedule.
+           r (float): well radius [L].
+
+        Raises:
+            theis_well.Error: Base class for all exceptions raised by this
+                module.
+            theis_well.InvalidRadiusError: The specified well radius was not
+                strictly positive.
+            theis_well.InvalidScheduleError: The pumping schedule must be
+                non-empty with increasing start times.
+        """
+        if r < numpy.finfo(float).eps:
+            raise InvalidRadiusError
+
+        schedule = [(float(t), float(Q)) for t, Q in schedule]
+        if not schedule:
+            raise InvalidScheduleError
+        if any(b[0] <= a[0] for a, b in zip(schedule, schedule[1:])):
+            raise InvalidScheduleError
+
+        self.z = z
+        self.schedule = schedule
+        self.r = r
+
+    # --------------------------------------------------------------------------
+    def __repr__(self):
+        return 'TheisWell({0.z!r},{0.schedule!r},{0.r!r})'.format(self)
+
+    # --------------------------------------------------------------------------
+    def __str__(self):
+        return 'TheisWell(z={0.z!s},schedule={0.schedule!s},r={0.r!s})'.format(
+            self)
+
+    # --------------------------------------------------------------------------
+    def _steps(self):
+        """Return the start times and the changes in discharge."""
+        t, Q = numpy.array(self.schedule).T
+        return t, numpy.diff(Q, prepend=0.0)
+
+    # --------------------------------------------------------------------------
+    def discharge(self, t):
+        """
+        TheisWell's discharge at time(s) <t>.
+
+        Arguments:
+            t (float or ndarray): time(s) [T].
+
+        Returns:
+            float or ndarray: well discharge at time <t> [L^3/T]. The
+                discharge is 0 before the first start time.
+
+        """
+        ts, dQ = self._steps()
+        t = numpy.asarray(t, dtype=float)
+        on = t[..., numpy.newaxis] >= ts
+        return numpy.sum(numpy.where(on, dQ, 0.0), axis=-1)[()]
+
+    # --------------------------------------------------------------------------
+    def discharge_potential(self, geo, t, z):
+        """
+        TheisWell's change in the discharge potential.
+
+        Arguments:
+            geo (Geology): the hydrogeologic librarian.
+            t (float or ndarray): time(s) [T].
+            z (complex or ndarray): 'little z' world coordinate location [L].
+
+        Returns:
+            float or ndarray: change in the discharge potential at time <t>
+                and location <z> [L^3/T], with shape t.shape + z.shape.
+
+        Notes:
+        -   If the location <z> is inside the radius of the well, the
+            discharge potential at the radius of the well is returned.
+
+        """
+        T = geo.transmissivity(self.z)
+        S = geo.storativity(self.z)
+        ts, dQ = self._steps()
+
+        t = numpy.asarray(t, dtype=float)
+        z = numpy.asarray(z, dtype=complex)
+        r2 = numpy.maximum(numpy.abs(z - self.z), self.r)**2
+
+        # Broadcast to shape t.shape + z.shape + (nsteps,).
+        tt = t.reshape(t.shape + (1,)*z.ndim + (1,)) - ts
+        active = tt > 0
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            u = numpy.where(active, r2[..., numpy.newaxis] * S / (4*T*tt),
+                            numpy.inf)
+        E1 = scipy.special.exp1(u)
+
+        Phi = -numpy.sum(dQ * E1, axis=-1) / (4*numpy.pi)
+        return Phi[()]
+
+    # --------------------------------------------------------------------------
+    def drawdown(self, geo, t, z):
+        """
+        TheisWell's drawdown.
+
+        Arguments:
+            geo (Geology): the hydrogeologic librarian.
+            t (float or ndarray): time(s) [T].
+            z (complex or ndarray): 'little z' world coordinate location [L].
+
+        Returns:
+            float or ndarray: drawdown at time <t> and location <z> [L], with
+                shape t.shape + z.shape. A positive value is a decline in the
+                head.
+
+        """
+        T = geo.transmissivity(self.z)
+        return -self.discharge_potential(geo, t, z) / T
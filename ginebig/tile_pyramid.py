@@ -0,0 +1,185 @@
+"""<tile_pyramid.py> implements the TilePyramid class.
+
+This file is part of the Ginebig Project and is distributed under the
+BSD-3-Clause license. See the accompanying LICENSE.txt file.
+
+Copyright (c) 2017, Randal J. Barnes
+"""
+
+import os
+import shutil
+import tempfile
+
+import numpy
+
+__version__ = '07 June 2017'
+
+
+# ------------------------------------------------------------------------------
+class Error(Exception):
+    """Base class for all exceptions raised by this module."""
+
+
+class InvalidTileSizeError(Error):
+    """The tile size must be 2**k + 1 nodes, with k >= 1."""
+
+
+class InvalidTileError(Error):
+    """The tile key is outside of the pyramid."""
+
+
+# ------------------------------------------------------------------------------
+class TilePyramid(object):
+    """A multi-resolution pyramid of head-map tiles, cached on disk.
+
+    Level 0 is a single tile covering the square extent of the pyramid.
+    Level L holds 2**L by 2**L tiles; tile (L, i, j) is the i-th tile from
+    xmin and the j-th tile from ymin. Each tile is an (n, n) array of heads
+    at the nodes of a regular grid that includes the tile edges, so adjacent
+    tiles share their edge nodes. Row 0 of a tile is at the bottom (smallest
+    y), as in model.grid().
+
+    Tiles are computed on demand and cached as <cachedir>/L/i/j.npy. Because
+    n = 2**k + 1, every node of a tile is also a node of one of its four
+    children, so a tile whose children are all cached is built by decimating
+    them, without evaluating any analytic element. Warm tiles are read from
+    disk.
+
+    Notes:
+    -   The cache does not track changes to the model. Call clear() after
+        changing the model, or give each model its own <cachedir>.
+    """
+
+    # --------------------------------------------------------------------------
+    def __init__(self, model, xmin: float, ymin: float, size: float,
+                 cachedir: str, tilesize: int = 257, precision='double'):
+        """Initialize the TilePyramid class.
+
+        Arguments:
+            model (Model): the model to evaluate.
+            xmin, ymin (float): lower-left corner of the pyramid [L].
+            size (float): side length of the level 0 tile [L].
+            cachedir (str): directory for the cached .npy tiles.
+            tilesize (int): number of nodes on each side of a tile; must be
+                2**k + 1.
+            precision (str): 'double' or 'single', passed to the model.
+
+        Raises:
+            InvalidTileSizeError: The tile size must be 2**k + 1 nodes, with
+                k >= 1.
+        """
+        m = tilesize - 1
+        if m < 2 or m & (m-1):
+            raise InvalidTileSizeError
+
+        self.model = model
+        self.xmin = xmin
+        self.ymin = ymin
+        self.size = size
+        self.cachedir = cachedir
+        self.tilesize = tilesize
+        self.precision = precision
+
+    # --------------------------------------------------------------------------
+    def __repr__(self):
+        return ('TilePyramid({0.model!r},{0.xmin!r},{0.ymin!r},{0.size!r},'
+                '{0.cachedir!r},{0.tilesize!r},{0.precision!r})'.format(self))
+
+    # --------------------------------------------------------------------------
+    def extent(self, level: int, i: int, j: int):
+        """Return the (xmin, xmax, ymin, ymax) of tile (level, i, j) [L].
+
+        Raises:
+            InvalidTileError: The tile key is outside of the pyramid.
+        """
+        n = 2**level
+        if level < 0 or not (0 <= i < n and 0 <= j < n):
+            raise InvalidTileError
+
+        width = self.size / n
+        x0 = self.xmin + i*width
+        y0 = self.ymin + j*width
+        return x0, x0 + width, y0, y0 + width
+
+    # --------------------------------------------------------------------------
+    def path(self, level: int, i: int, j: int) -> str:
+        """Return the cache file name of tile (level, i, j)."""
+        return os.path.join(self.cachedir, str(level), str(i),
+                            '{0}.npy'.format(j))
+
+    # --------------------------------------------------------------------------
+    def iscached(self, level: int, i: int, j: int) -> bool:
+        """Return True if tile (level, i, j) is in the disk cache."""
+        return os.path.exists(self.path(level, i, j))
+
+    # --------------------------------------------------------------------------
+    def tile(self, level: int, i: int, j: int):
+        """
+        Return the head tile (level, i, j).
+
+        The tile is read from the disk cache if possible; otherwise it is
+        decimated from four cached children if possible; otherwise it is
+        evaluated from the model. New tiles are written to the cache.
+
+        Arguments:
+            level (int): pyramid level, 0 is the coarsest.
+            i (int): tile column, counted from xmin.
+            j (int): tile row, counted from ymin.
+
+        Returns:
+            ndarray: (tilesize, tilesize) array of heads [L].
+
+        Raises:
+            InvalidTileError: The tile key is outside of the pyramid.
+        """
+        xmin, xmax, ymin, ymax = self.extent(level, i, j)
+
+        path = self.path(level, i, j)
+        if os.path.exists(path):
+            return numpy.load(path)
+
+        children = [(level+1, 2*i + di, 2*j + dj)
+                    for dj in (0, 1) for di in (0, 1)]
+        if all(self.iscached(*key) for key in children):
+            heads = self._decimate([numpy.load(self.path(*key))
+                                    for key in children])
+        else:
+            n = self.tilesize
+            heads = self.model.head_grid(xmin, xmax, ymin, ymax, n, n,
+                                         self.precision)
+
+        self._save(path, heads)
+        return heads
+
+    # --------------------------------------------------------------------------
+    def _decimate(self, children):
+        """Build a tile from its four children, ordered (0,0),(1,0),(0,1),(1,1).
+        """
+        h = (self.tilesize - 1) // 2
+        a, b, c, d = (child[::2, ::2] for child in children)
+
+        heads = numpy.empty((self.tilesize, self.tilesize), dtype=a.dtype)
+        heads[:h+1, :h+1] = a
+        heads[:h+1, h:] = b
+        heads[h:, :h+1] = c
+        heads[h:, h:] = d
+        return heads
+
+    # --------------------------------------------------------------------------
+    def _save(self, path, heads):
+        """Write a tile atomically, so readers never see a partial file."""
+        folder = os.path.dirname(path)
+        os.makedirs(folder, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(suffix='.npy', dir=folder)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                numpy.save(f, heads)
+            os.replace(tmp, path)
+        except BaseException:
+            os.remove(tmp)
+            raise
+
+    # --------------------------------------------------------------------------
+    def clear(self):
+        """Remove every cached tile."""
+        shutil.rmtree(self.cachedir, ignore_errors=True)
@@ -0,0 +1,107 @@
+"""<tracking.py> implements steady-state particle tracking.
+
+This file is part of the Ginebig Project and is distributed under the
+BSD-3-Clause license. See the accompanying LICENSE.txt file.
+
+Copyright (c) 2017, Randal J. Barnes
+"""
+
+import numpy
+
+__version__ = '07 June 2017'
+
+
+# ------------------------------------------------------------------------------
+class Error(Exception):
+    """Base class for all exceptions raised by this module."""
+
+
+class InvalidStepError(Error):
+    """The step length must be strictly positive."""
+
+
+# ------------------------------------------------------------------------------
+def velocity(model, z):
+    """
+    Average linear (seepage) velocity at location <z>.
+
+    The discharge vector is divided by the porosity and by the saturated
+    thickness, which is H where the aquifer is confined and head - b where
+    it is unconfined.
+
+    Arguments:
+        model (Model): a solved model.
+        z (complex or ndarray): 'little z' world coordinate location [L].
+
+    Returns:
+        complex or ndarray: velocity vx + i vy at location <z> [L/T]; NaN
+            inside of a well.
+    """
+    k, rho, H, b = model.geo.properties(z)
+    head = model.head(z)
+    thickness = numpy.minimum(H, head - b)
+    return (numpy.conj(model.complex_discharge(z)) / (rho*thickness))[()]
+
+
+# ------------------------------------------------------------------------------
+def track(model, z, step: float, nsteps: int, backward: bool = False):
+    """
+    Trace pathlines from the starting locations <z>.
+
+    The pathlines are traced with a fixed spatial step, using the midpoint
+    rule on the velocity direction; the travel time of each step is the
+    step length divided by the midpoint speed. All of the particles are
+    advanced together, so each step costs two vectorized model evaluations.
+
+    Arguments:
+        model (Model): a solved model.
+        z (complex or ndarray): starting locations [L].
+        step (float): step length [L].
+        nsteps (int): number of steps.
+        backward (bool): trace against the flow, e.g. to delineate capture
+            zones.
+
+    Returns:
+        (ndarray, ndarray): the pathline vertices and the travel times [T],
+            each with shape z.shape + (nsteps+1,). A particle that comes
+            within one step of a well screen is captured, and a particle
+            that reaches a stagnation point stops; their later vertices and
+            times are NaN.
+
+    Raises:
+        InvalidStepError: The step length must be strictly positive.
+    """
+    if not step > 0:
+        raise InvalidStepError
+
+    sign = -1 if backward else 1
+    z = numpy.asarray(z, dtype=complex)
+    zf = z.ravel()
+
+    paths = numpy.full((zf.size, nsteps+1), numpy.nan, dtype=complex)
+    times = numpy.full((zf.size, nsteps+1), numpy.nan)
+    paths[:, 0] = zf
+    times[:, 0] = 0
+
+    live = numpy.arange(zf.size)
+    for n in range(nsteps):
+        zn = paths[live, n]
+        with numpy.errstate(invalid='ignore', divide='ignore'):
+            v = sign*velocity(model, zn)
+            zm = zn + 0.5*step*v/numpy.abs(v)
+            vm = sign*velocity(model, zm)
+            speed = numpy.abs(vm)
+
+        ok = numpy.isfinite(vm) & (speed > 0) & numpy.isfinite(v)
+        live, zn, vm, speed = live[ok], zn[ok], vm[ok], speed[ok]
+        if live.size == 0:
+            break
+        paths[live, n+1] = zn + step*vm/speed
+        times[live, n+1] = times[live, n] + step/speed
+
+        # A particle within one step of a well screen is captured.
+        captured, wells = model.well_index().pairs(paths[live, n+1], step)
+        live = numpy.delete(live, captured)
+
+    shape = z.shape + (nsteps+1,)
+    return paths.reshape(shape), times.reshape(shape)
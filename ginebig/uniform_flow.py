@@ -7,6 +7,7 @@ Copyright (c) 2017, Randal J. Barnes
 """
 
 import cmath
+import numpy
 
 from ginebig.analytic_element import AnalyticElement
 
@@ -20,6 +21,11 @@ class Error(Exception):
 
 # ------------------------------------------------------------------------------
 class UniformFlow(AnalyticElement):
+    """A uniform flow of magnitude Qo in the direction alpha.
+
+    All of the evaluation methods accept either a single complex location or
+    a numpy array of complex locations, and return a result of the same shape.
+    """
 
     # --------------------------------------------------------------------------
     def __init__(self, Qo: float, alpha: float):
@@ -42,6 +48,24 @@ class UniformFlow(AnalyticElement):
     def __str__(self):
         return 'UniformFlow(Qo={0.Qo!s},alpha={0.alpha!s})'.format(self)
 
+    # --------------------------------------------------------------------------
+    def translation_constant(self, dz: complex) -> complex:
+        """
+        Constant restoring the complex potential after a translation.
+
+        Arguments:
+            dz (complex): translation [L].
+
+        Returns:
+            complex: the constant [L^3/T].
+
+        Notes:
+        -   The uniform flow has no location, so the translated copy is
+            identical and the constant is -Omega(dz).
+
+        """
+        return -self.complex_potential(dz)
+
     # --------------------------------------------------------------------------
     def complex_potential(self, z: complex) -> complex:
         """
@@ -51,17 +75,18 @@ class UniformFlow(AnalyticElement):
         Omega(z) [L^3/T], evaluated at location <z>.
 
         Arguments:
-            z (complex): 'little z' world coordinate location [L].
+            z (complex or ndarray): 'little z' world coordinate location [L].
 
         Returns:
-            complex: complex potential at location <z> [L^3/T].
+            complex or ndarray: complex potential at location <z> [L^3/T].
 
         Notes:
         -   The location <z> does not make any difference for uniform flow.
 
         """
+        z = numpy.asarray(z)
         Omega = -self.Qo * cmath.exp(-complex(0, self.alpha)) * z
-        return Omega
+        return Omega[()]
 
     # --------------------------------------------------------------------------
     def complex_discharge(self, z: complex) -> complex:
@@ -72,17 +97,19 @@ class UniformFlow(AnalyticElement):
         function, W(z) [L^2/T], at location <z>.
 
         Arguments:
-            z (complex): 'little z' world coordinate location [L].
+            z (complex or ndarray): 'little z' world coordinate location [L].
 
         Returns:
-            complex: complex discharge at location <z> [L^2/T].
+            complex or ndarray: complex discharge at location <z> [L^2/T].
 
         Notes:
         -   The location <z> does not make any difference for uniform flow.
 
         """
-        W = self.Qo * cmath.exp(-complex(0, self.alpha))
-        return W
+        z = numpy.asarray(z)
+        W = numpy.full(z.shape, self.Qo * cmath.exp(-complex(0, self.alpha)),
+                       dtype=numpy.result_type(z, 1j))
+        return W[()]
 
     # --------------------------------------------------------------------------
     def abstraction(self):
@@ -101,16 +128,17 @@ class UniformFlow(AnalyticElement):
         UniformFlow's divergence of the discharge at location <z>.
 
         Arguments:
-            z (complex): 'little z' world coordinate location [L].
+            z (complex or ndarray): 'little z' world coordinate location [L].
 
         Returns:
-            float: divergence of the discharge at location <z> [L/T].
+            float or ndarray: divergence of the discharge at location <z>
+                [L/T].
 
         Notes:
         -   The divergence of the discharge for UniformFlow is 0 everywhere.
 
         """
-        return float(0)
+        return numpy.zeros(numpy.shape(z))[()]
 
     # --------------------------------------------------------------------------
     def solve(self, geo, root):
@@ -25,6 +25,12 @@ class InvalidRadiusError(Error):
 
 # ------------------------------------------------------------------------------
 class Well(AnalyticElement):
+    """A steady-state well with a specified discharge.
+
+    All of the evaluation methods accept either a single complex location or
+    a numpy array of complex locations, and return a result of the same shape.
+    The precision of a complex64 array of locations is preserved.
+    """
 
     # --------------------------------------------------------------------------
     def __init__(self, z: complex, Q: float, r: float):
@@ -45,7 +51,7 @@ class Well(AnalyticElement):
         if r < numpy.finfo(float).eps:
             raise InvalidRadiusError
 
-        self.z = z
+        self.z = complex(z)
         self.Q = Q
         self.r = r
 
@@ -58,7 +64,21 @@ class Well(AnalyticElement):
         return 'Well(z={0.z!s},Q={0.Q!s},r={0.r!s})'.format(self)
 
     # --------------------------------------------------------------------------
-    def complex_potential(self, z: complex) -> complex:
+    def _local(self, z):
+        """Return the locations <z> relative to the center, as complex."""
+        z = numpy.asarray(z)
+        z = z.astype(numpy.result_type(z, numpy.complex64))
+        return numpy.array(z - complex(self.z))
+
+    # --------------------------------------------------------------------------
+    def _inside(self, zz, inside):
+        """Return the flat indices of the local locations <zz> in the well."""
+        if inside is None:
+            return numpy.flatnonzero(numpy.abs(zz) < self.r)
+        return inside
+
+    # --------------------------------------------------------------------------
+    def complex_potential(self, z: complex, inside=None) -> complex:
         """
         Well's complex potential at location <z>.
 
@@ -66,25 +86,26 @@ class Well(AnalyticElement):
         Omega(z) [L^3/T], evaluated at location <z>.
 
         Arguments:
-            z (complex): 'little z' world coordinate location [L].
+            z (complex or ndarray): 'little z' world coordinate location [L].
+            inside (ndarray): flat indices into <z> of the locations inside
+                the radius of the well, e.g. from a WellIndex. If None, they
+                are found by a distance test.
 
         Returns:
-            complex: complex potential at location <z> [L^3/T].
+            complex or ndarray: complex potential at location <z> [L^3/T].
 
         Notes:
         -   If the location <z> is inside the radius of the well, the
             complex potential at the radius of the well is returned.
 
         """
-        zz = z - self.z
-        if abs(zz) >= self.r:
-            Omega = self.Q/(2*cmath.pi) * cmath.log(zz)
-        else:
-            Omega = self.Q/(2*cmath.pi) * cmath.log(self.r)
-        return Omega
+        zz = self._local(z)
+        zz.reshape(-1)[self._inside(zz, inside)] = self.r
+        Omega = self.Q/(2*cmath.pi) * numpy.log(zz)
+        return Omega[()]
 
     # --------------------------------------------------------------------------
-    def complex_discharge(self, z: complex) -> complex:
+    def complex_discharge(self, z: complex, inside=None) -> complex:
         """
         Well's complex discharge at location <z>.
 
@@ -92,22 +113,23 @@ class Well(AnalyticElement):
         function, W(z) [L^2/T], at location <z>.
 
         Arguments:
-            z (complex): 'little z' world coordinate location [L].
+            z (complex or ndarray): 'little z' world coordinate location [L].
+            inside (ndarray): flat indices into <z> of the locations inside
+                the radius of the well, or None.
 
         Returns:
-            complex: complex discharge at location <z> [L^2/T].
+            complex or ndarray: complex discharge at location <z> [L^2/T].
 
         Notes:
         -   If the location <z> is inside the radius of the well, math.nan
             is returned.
 
         """
-        zz = z - self.z
-        if abs(zz) >= self.r:
+        zz = self._local(z)
+        zz.reshape(-1)[self._inside(zz, inside)] = cmath.nan
+        with numpy.errstate(invalid='ignore', divide='ignore'):
             W = -self.Q/(2*cmath.pi) / zz
-        else:
-            W = complex(cmath.nan, cmath.nan)
-        return W
+        return W[()]
 
     # --------------------------------------------------------------------------
     def abstraction(self):
@@ -125,27 +147,28 @@ class Well(AnalyticElement):
         return self.Q
 
     # --------------------------------------------------------------------------
-    def divergence_discharge(self, z: complex) -> float:
+    def divergence_discharge(self, z: complex, inside=None) -> float:
         """
         Well's divergence of the discharge at location <z>.
 
         Arguments:
-            z (complex): 'little z' world coordinate location [L].
+            z (complex or ndarray): 'little z' world coordinate location [L].
+            inside (ndarray): flat indices into <z> of the locations inside
+                the radius of the well, or None.
 
         Returns:
-            float: divergence of the discharge at location <z> [L/T].
+            float or ndarray: divergence of the discharge at location <z>
+                [L/T].
 
         Notes:
         -   If the location <z> is inside the radius of the well, math.nan
             is returned.
 
         """
-        zz = z - self.z
-        if abs(zz) >= self.r:
-            div = float(0)
-        else:
-            div = cmath.nan
-        return div
+        zz = self._local(z)
+        div = numpy.zeros(numpy.shape(zz))
+        div.reshape(-1)[self._inside(zz, inside)] = cmath.nan
+        return div[()]
 
     # --------------------------------------------------------------------------
     def solve(self, geo, root):
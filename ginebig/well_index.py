@@ -0,0 +1,130 @@
+"""<well_index.py> implements the WellIndex class.
+
+This file is part of the Ginebig Project and is distributed under the
+BSD-3-Clause license. See the accompanying LICENSE.txt file.
+
+Copyright (c) 2017, Randal J. Barnes
+"""
+
+import numpy
+
+__version__ = '07 June 2017'
+
+
+# ------------------------------------------------------------------------------
+class WellIndex(object):
+    """A KD-tree over the centers and radii of a set of wells.
+
+    The index answers "which wells are within a distance of these points"
+    without forming the dense (points x wells) distance matrix. One
+    vectorized nearest-well query finds the few points that have any well
+    within reach; only those points are matched against all of the wells in
+    reach. For M points and N wells the cost is O(M log N), plus the size of
+    the answer.
+
+    The index is built once and reused across evaluations; it only depends
+    on the well locations and radii, not on their discharges.
+    """
+
+    # --------------------------------------------------------------------------
+    def __init__(self, wells):
+        """Initialize the WellIndex class.
+
+        Arguments:
+            wells (sequence of Well): the indexed wells.
+        """
+        self.wells = list(wells)
+        self.centers = numpy.array([w.z for w in self.wells], dtype=complex)
+        self.radii = numpy.array([w.r for w in self.wells], dtype=float)
+        self.rmax = self.radii.max() if self.wells else float(0)
+
+        # scipy.spatial takes a noticeable time to import, so it is only
+        # imported when an index is actually built.
+        self._tree = None
+        if self.wells:
+            import scipy.spatial
+            self._tree = scipy.spatial.cKDTree(
+                numpy.column_stack([self.centers.real, self.centers.imag]))
+
+    # --------------------------------------------------------------------------
+    def __len__(self):
+        return len(self.wells)
+
+    # --------------------------------------------------------------------------
+    def pairs(self, z, radius: float = 0):
+        """
+        Return the (point, well) pairs within <radius> of the well screens.
+
+        A point z[i] and well k are paired if |z[i] - z_k| < r_k + radius.
+        With the default radius of 0, these are the points inside the wells.
+
+        Arguments:
+            z (complex or ndarray): 'little z' world coordinate location [L].
+            radius (float): distance beyond the well radius [L].
+
+        Returns:
+            (ndarray, ndarray): the flat indices of the points into <z>, and
+                the indices of the wells into self.wells.
+        """
+        zf = numpy.asarray(z, dtype=complex).ravel()
+        empty = numpy.empty(0, dtype=numpy.intp)
+        if self._tree is None or zf.size == 0:
+            return empty, empty
+
+        # Non-finite locations (e.g. NaN) are never paired.
+        reach = self.rmax + radius
+        finite = numpy.flatnonzero(numpy.isfinite(zf))
+        xy = numpy.column_stack([zf.real, zf.imag])
+        dist, nearest = self._tree.query(xy[finite], k=1,
+                                         distance_upper_bound=reach)
+        candidates = finite[numpy.isfinite(dist)]
+        if candidates.size == 0:
+            return empty, empty
+
+        lists = self._tree.query_ball_point(xy[candidates], reach)
+        counts = numpy.fromiter((len(x) for x in lists), dtype=numpy.intp,
+                                count=len(lists))
+        points = numpy.repeat(candidates, counts)
+        wells = numpy.fromiter((k for x in lists for k in x),
+                               dtype=numpy.intp, count=counts.sum())
+
+        keep = numpy.abs(zf[points] - self.centers[wells]) \
+            < self.radii[wells] + radius
+        return points[keep], wells[keep]
+
+    # --------------------------------------------------------------------------
+    def inside(self, z):
+        """
+        Return the indices of the points inside each well.
+
+        Arguments:
+            z (complex or ndarray): 'little z' world coordinate location [L].
+
+        Returns:
+            list of ndarray: for each well, the flat indices into <z> of the
+                points inside its radius.
+        """
+        points, wells = self.pairs(z)
+        order = numpy.argsort(wells, kind='stable')
+        bounds = numpy.searchsorted(wells[order], numpy.arange(len(self) + 1))
+        return [points[order[bounds[k]:bounds[k+1]]]
+                for k in range(len(self))]
+
+    # --------------------------------------------------------------------------
+    def neighbors(self, z, radius: float):
+        """
+        Return the near-field neighbor list of each point.
+
+        Arguments:
+            z (complex or ndarray): 'little z' world coordinate location [L].
+            radius (float): distance beyond the well radius [L].
+
+        Returns:
+            list of ndarray: for each flattened point, the indices of the
+                wells within <radius> of its screen.
+        """
+        n = numpy.size(z)
+        points, wells = self.pairs(z, radius)
+        order = numpy.argsort(points, kind='stable')
+        bounds = numpy.searchsorted(points[order], numpy.arange(n + 1))
+        return [wells[order[bounds[i]:bounds[i+1]]] for i in range(n)]
@@ -0,0 +1,25 @@
+"""Setup script for the Ginebig package.
+
+This file is part of the Ginebig Project and is distributed under the
+BSD-3-Clause license. See the accompanying LICENSE.txt file.
+
+Copyright (c) 2017, Randal J. Barnes
+"""
+
+from setuptools import setup
+
+setup(
+    name='ginebig',
+    version='0.1',
+    description='An object-oriented, steady-state groundwater modeling '
+                'framework using the Analytic Element Method.',
+    author='Randal J. Barnes',
+    author_email='barne003@umn.edu',
+    license='BSD-3-Clause',
+    packages=['ginebig'],
+    python_requires='>=3.9',
+    install_requires=['numpy>=1.16', 'scipy>=1.6'],
+    entry_points={
+        'console_scripts': ['ginebig = ginebig.cli:main'],
+    },
+)
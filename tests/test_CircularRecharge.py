@@ -0,0 +1,96 @@
+import unittest
+import cmath
+import numpy
+
+from ginebig.analytic_element import AnalyticElement
+from ginebig.circular_recharge import CircularRecharge, InvalidRadiusError
+
+
+class TestCircularRecharge(unittest.TestCase):
+    """Test the CircularRecharge class."""
+
+    # --------------------------------------------------------------------------
+    def test_construction(self):
+        """Test constructor."""
+        cr = CircularRecharge(complex(1, 2), 0.01, 4)
+
+        self.assertIsInstance(cr, AnalyticElement)
+        self.assertIsInstance(cr, CircularRecharge)
+
+        self.assertAlmostEqual(cr.z, complex(1, 2))
+        self.assertAlmostEqual(cr.N, 0.01)
+        self.assertAlmostEqual(cr.R, 4)
+
+        self.assertRaises(InvalidRadiusError,
+                          CircularRecharge, complex(1, 2), 0.01, -1)
+
+    # --------------------------------------------------------------------------
+    def test_complex_potential(self):
+        """Test complex potential."""
+
+        zo = complex(10, 10)
+        cr = CircularRecharge(zo, 2, 1)
+
+        z = complex(10, 20)
+        Omega_true = -complex(cmath.log(10), cmath.pi/2)
+        Omega = CircularRecharge.complex_potential(cr, z)
+        self.assertAlmostEqual(Omega, Omega_true)
+
+        z = complex(10.5, 10)
+        Omega = CircularRecharge.complex_potential(cr, z)
+        self.assertAlmostEqual(Omega.real, 0.5*(1 - 0.25))
+        self.assertTrue(cmath.isnan(Omega.imag))
+
+        # The discharge potential is continuous across the circle.
+        z = zo + numpy.array([1-1e-9, 1+1e-9])
+        Omega = CircularRecharge.complex_potential(cr, z)
+        self.assertAlmostEqual(Omega[0].real, Omega[1].real)
+
+    # --------------------------------------------------------------------------
+    def test_real_locations(self):
+        """Test evaluation at real-valued locations and centers."""
+
+        cr = CircularRecharge(0, 1e-3, 10)
+        Omega = cr.complex_potential(-500.0)
+        self.assertAlmostEqual(Omega, -0.5*1e-3*100 * cmath.log(-500))
+
+        W = cr.complex_discharge(numpy.array([-500.0, 5.0]))
+        numpy.testing.assert_allclose(W, [0.5*1e-3*100/-500, 0.5*1e-3*5])
+
+    # --------------------------------------------------------------------------
+    def test_complex_discharge(self):
+        """Test complex discharge."""
+
+        zo = complex(10, 10)
+        cr = CircularRecharge(zo, 2, 1)
+
+        z = numpy.array([complex(20, 10), complex(10, 20), complex(10.5, 10)])
+        W_true = numpy.array([1/complex(10, 0), 1/complex(0, 10), 0.5])
+        W = CircularRecharge.complex_discharge(cr, z)
+        numpy.testing.assert_allclose(W, W_true)
+
+    # --------------------------------------------------------------------------
+    def test_abstraction(self):
+        """Test abstraction."""
+
+        cr = CircularRecharge(complex(10, 10), 2, 1)
+
+        ab = CircularRecharge.abstraction(cr)
+        self.assertAlmostEqual(ab, -2*cmath.pi)
+
+    # --------------------------------------------------------------------------
+    def test_divergence_discharge(self):
+        """Test divergence discharge."""
+
+        cr = CircularRecharge(complex(10, 10), 2, 1)
+
+        z = numpy.array([complex(10, 20), complex(10.5, 10.5)])
+        div = CircularRecharge.divergence_discharge(cr, z)
+        numpy.testing.assert_allclose(div, [0, 2])
+
+        div = CircularRecharge.divergence_discharge(cr, complex(10, 10))
+        self.assertAlmostEqual(div, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,160 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+import unittest
+import numpy
+
+from ginebig.cli import InvalidManifestError, load_model, main, run
+from ginebig.tracking import track
+
+
+class TestCli(unittest.TestCase):
+    """Test the command-line batch runner."""
+
+    # --------------------------------------------------------------------------
+    def setUp(self):
+        """Write a model file and a job manifest."""
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+
+        self.model_doc = {
+            'geology': {'hydraulic_conductivity': 10, 'aquifer_porosity': 0.25,
+                        'aquifer_thickness': 20, 'base_elevation': 100},
+            'elements': [
+                {'type': 'Well', 'z': [300, 700], 'Q': 500, 'r': 0.2},
+                {'type': 'Well', 'z': [900, 100], 'Q': 100, 'r': 0.2,
+                 'active': False},
+                {'type': 'UniformFlow', 'Qo': 1, 'alpha': 0.5},
+                {'type': 'PolygonRecharge', 'N': 0.001,
+                 'vertices': [[0, 0], [200, 0], [200, 200]]},
+                {'type': 'ReferencePoint', 'z': [5000, 0], 'head': 125},
+            ],
+        }
+        self.write('model.json', self.model_doc)
+
+        self.manifest = {
+            'model': 'model.json',
+            'output': 'out',
+            'tasks': [
+                {'name': 'ref', 'type': 'solve'},
+                {'name': 'obs', 'type': 'points',
+                 'points': [[0, 0], [10, 5], [300, 700]]},
+                {'name': 'map', 'type': 'grid', 'xmin': 0, 'xmax': 1000,
+                 'ymin': 0, 'ymax': 500, 'nx': 21, 'ny': 11},
+                {'name': 'paths', 'type': 'track', 'file': 'starts.csv',
+                 'step': 10, 'nsteps': 20, 'backward': True},
+                {'name': 'bad', 'type': 'nonsense'},
+            ],
+        }
+        self.write('job.json', self.manifest)
+        numpy.savetxt(os.path.join(self.dir, 'starts.csv'),
+                      [[250, 700], [0, 300]], delimiter=',')
+
+    # --------------------------------------------------------------------------
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    # --------------------------------------------------------------------------
+    def write(self, name, doc):
+        with open(os.path.join(self.dir, name), 'w') as f:
+            json.dump(doc, f)
+
+    # --------------------------------------------------------------------------
+    def test_load_model(self):
+        """Test building a model from a model file."""
+
+        model = load_model(os.path.join(self.dir, 'model.json'))
+        self.assertEqual(len(model.elements), 5)
+        self.assertEqual(model.elements[0].z, complex(300, 700))
+        self.assertFalse(model.elements[1].isactive())
+
+        self.model_doc['elements'].append({'type': 'Lake'})
+        self.write('model.json', self.model_doc)
+        self.assertRaises(InvalidManifestError, load_model,
+                          os.path.join(self.dir, 'model.json'))
+
+    # --------------------------------------------------------------------------
+    def test_run(self):
+        """Test the tasks, in process and on a worker pool."""
+
+        model = load_model(os.path.join(self.dir, 'model.json'))
+        model.solve()
+        out = os.path.join(self.dir, 'out')
+
+        for workers in (1, 2):
+            summary = run(os.path.join(self.dir, 'job.json'), workers,
+                          stream=None)
+            tasks = summary['tasks']
+            self.assertEqual([t['name'] for t in tasks],
+                             ['ref', 'obs', 'map', 'paths', 'bad'])
+            self.assertTrue(all(t['seconds'] >= 0 and t['peak_bytes'] >= 0
+                                for t in tasks))
+            self.assertIn('error', tasks[4])
+            self.assertAlmostEqual(tasks[0]['constant'], model.constant)
+
+            with numpy.load(os.path.join(out, 'obs.npz')) as result:
+                numpy.testing.assert_allclose(
+                    result['head'],
+                    model.head(numpy.array([0, 10+5j, 300+700j])))
+            with numpy.load(os.path.join(out, 'map.npz')) as result:
+                numpy.testing.assert_allclose(
+                    result['head'], model.head_grid(0, 1000, 0, 500, 21, 11))
+            with numpy.load(os.path.join(out, 'paths.npz')) as result:
+                paths, times = track(model, numpy.array([250+700j, 300j]),
+                                     10, 20, backward=True)
+                numpy.testing.assert_allclose(result['paths'], paths)
+                numpy.testing.assert_allclose(result['times'], times)
+
+            with open(os.path.join(out, 'summary.json')) as f:
+                self.assertEqual(json.load(f)['workers'], workers)
+
+        self.assertFalse(tracemalloc.is_tracing())
+
+    # --------------------------------------------------------------------------
+    def test_main(self):
+        """Test the console entry point and the lazy imports."""
+
+        del self.manifest['tasks'][-1]
+        self.write('job.json', self.manifest)
+        self.assertEqual(main(['-q', os.path.join(self.dir, 'job.json')]), 0)
+        self.assertEqual(main(['-q', os.path.join(self.dir, 'none.json')]), 2)
+
+        # A relative --output is relative to the current directory.
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as other:
+            try:
+                os.chdir(other)
+                self.assertEqual(main(['-q', '-o', 'results',
+                                       os.path.join(self.dir, 'job.json')]),
+                                 0)
+                self.assertTrue(os.path.isfile(
+                    os.path.join(other, 'results', 'summary.json')))
+            finally:
+                os.chdir(cwd)
+        self.assertFalse(os.path.exists(os.path.join(self.dir, 'results')))
+
+        code = 'import sys, ginebig.cli; print("numpy" in sys.modules)'
+        out = subprocess.run([sys.executable, '-c', code], check=True,
+                             capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.dirname(__file__)))
+        self.assertEqual(out.stdout.strip(), 'False')
+
+        # A small points job does not import scipy.spatial.
+        self.manifest['tasks'] = self.manifest['tasks'][1:2]
+        self.write('job.json', self.manifest)
+        code = ('import sys, ginebig.cli; '
+                'code = ginebig.cli.main(["-q", sys.argv[1]]); '
+                'print(code, "scipy.spatial" in sys.modules)')
+        out = subprocess.run([sys.executable, '-c', code,
+                              os.path.join(self.dir, 'job.json')],
+                             check=True, capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.dirname(__file__)))
+        self.assertEqual(out.stdout.strip(), '0 False')
+
+
+if __name__ == '__main__':
+    unittest.main()
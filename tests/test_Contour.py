@@ -0,0 +1,105 @@
+import unittest
+import numpy
+
+from ginebig.contour import ContourBuilder, InvalidTileError, contours
+from ginebig.geology import Geology
+from ginebig.model import Model, grid
+from ginebig.reference_point import ReferencePoint
+from ginebig.well import Well
+
+
+# ------------------------------------------------------------------------------
+def vertex_set(line):
+    return sorted(numpy.round(line, 9).tolist(), key=lambda z: (z.real, z.imag))
+
+
+class TestContour(unittest.TestCase):
+    """Test the ContourBuilder class."""
+
+    # --------------------------------------------------------------------------
+    def setUp(self):
+        x = numpy.linspace(-2, 2, 81)
+        self.F = x[numpy.newaxis, :]**2 + x[:, numpy.newaxis]**2
+
+    # --------------------------------------------------------------------------
+    def test_closed_and_open(self):
+        """Test a closed circle and the open arcs cut by the grid edge."""
+
+        result = contours(self.F, -2, 2, -2, 2, [1.0, 5.0])
+
+        self.assertEqual(len(result[1.0]), 1)
+        circle = result[1.0][0]
+        self.assertEqual(circle[0], circle[-1])
+        numpy.testing.assert_allclose(numpy.abs(circle), 1, atol=1e-3)
+
+        self.assertEqual(len(result[5.0]), 4)
+        for arc in result[5.0]:
+            self.assertNotEqual(arc[0], arc[-1])
+            numpy.testing.assert_allclose(numpy.abs(arc), numpy.sqrt(5),
+                                          atol=1e-2)
+
+    # --------------------------------------------------------------------------
+    def test_tiles(self):
+        """Test tiles sharing their edge nodes are stitched seamlessly."""
+
+        whole = contours(self.F, -2, 2, -2, 2, [1.0])[1.0]
+
+        builder = ContourBuilder([1.0], -2, -2, 0.05, 0.05)
+        for row0 in (40, 0):
+            for col0 in (0, 40):
+                builder.add_tile(self.F[row0:row0+41, col0:col0+41],
+                                 row0, col0)
+        tiled = builder.contours()[1.0]
+
+        self.assertEqual(len(tiled), 1)
+        self.assertEqual(tiled[0][0], tiled[0][-1])
+        self.assertEqual(vertex_set(tiled[0][:-1]), vertex_set(whole[0][:-1]))
+
+        self.assertRaises(InvalidTileError, builder.add_tile, numpy.ones(5))
+
+    # --------------------------------------------------------------------------
+    def test_pop_closed(self):
+        """Test streaming of the completed closed contours."""
+
+        builder = ContourBuilder([1.0, 5.0], -2, -2, 0.05, 0.05)
+        builder.add_tile(self.F)
+
+        closed = builder.pop_closed()
+        self.assertEqual(len(closed[1.0]), 1)
+        self.assertEqual(len(closed[5.0]), 0)
+
+        remaining = builder.contours()
+        self.assertEqual(len(remaining[1.0]), 0)
+        self.assertEqual(len(remaining[5.0]), 4)
+
+    # --------------------------------------------------------------------------
+    def test_saddle_and_nan(self):
+        """Test the saddle cells and the cells with a NaN corner."""
+
+        values = numpy.array([[1.0, 0.0, 1.0],
+                              [0.0, 1.0, 0.0],
+                              [1.0, 0.0, numpy.nan]])
+        result = contours(values, 0, 2, 0, 2, [0.5])[0.5]
+        n = sum(len(line) - 1 for line in result)
+        self.assertEqual(n, 6)
+
+    # --------------------------------------------------------------------------
+    def test_heads(self):
+        """Test the head contours around a well are circles."""
+
+        model = Model(Geology(10, 0.25, 20, 100), [
+            Well(complex(0, 0), 100, 0.1),
+            ReferencePoint(complex(1000, 0), 125),
+        ])
+        model.solve()
+
+        heads = model.head(grid(-100, 100, -100, 100, 201, 201))
+        level = float(model.head(complex(50, 0)))
+        line = contours(heads, -100, 100, -100, 100, [level])[level]
+
+        self.assertEqual(len(line), 1)
+        numpy.testing.assert_allclose(numpy.abs(line[0]), 50, rtol=1e-3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,5 @@
 import unittest
+import numpy
 
 from ginebig.geology import (Geology, InvalidHeadError,
                              InvalidDischargePotentialError)
@@ -17,6 +18,10 @@ class TestGeology(unittest.TestCase):
         self.assertAlmostEqual(geo.aquifer_porosity, 0.2)
         self.assertAlmostEqual(geo.aquifer_thickness, 3)
         self.assertAlmostEqual(geo.base_elevation, 4)
+        self.assertAlmostEqual(geo.aquifer_storativity, 0.2)
+
+        geo = Geology(1, 0.2, 3, 4, 1e-4)
+        self.assertAlmostEqual(geo.aquifer_storativity, 1e-4)
 
     # --------------------------------------------------------------------------
     def test_properties(self):
@@ -32,6 +37,16 @@ class TestGeology(unittest.TestCase):
         self.assertAlmostEqual(H, 3)
         self.assertAlmostEqual(b, 4)
 
+    # --------------------------------------------------------------------------
+    def test_transmissivity_storativity(self):
+        """Test the transmissivity and storativity retrival."""
+
+        geo = Geology(2, 0.2, 3, 4, 1e-4)
+        z = complex(0, 0)
+
+        self.assertAlmostEqual(geo.transmissivity(z), 6)
+        self.assertAlmostEqual(geo.storativity(z), 1e-4)
+
     # --------------------------------------------------------------------------
     def test_head2Phi(self):
         """Test the head to discharge potential convertion."""
@@ -70,6 +85,47 @@ class TestGeology(unittest.TestCase):
         Phi = geo.head2Phi(head, z)
         self.assertAlmostEqual(Phi, 500)
 
+    # --------------------------------------------------------------------------
+    def test_gradients(self):
+        """Test the partial derivatives against finite differences."""
+
+        geo = Geology(2, 0.2, 3, 4)
+        z = complex(0, 0)
+        head = numpy.array([4.5, 6.0, 7.0, 7.5, 12.0])
+        Phi = geo.head2Phi(head, z)
+
+        def perturbed(name, delta):
+            other = Geology(2, 0.2, 3, 4)
+            setattr(other, name, getattr(other, name) + delta)
+            return other
+
+        names = ['hydraulic_conductivity', 'aquifer_thickness',
+                 'base_elevation']
+        h = 1e-6
+
+        d = geo.head2Phi_gradient(head, z)
+        numpy.testing.assert_allclose(
+            d[0], (geo.head2Phi(head+h, z) - geo.head2Phi(head-h, z))/(2*h),
+            rtol=1e-6)
+        for name, dp in zip(names, d[1:]):
+            fd = (perturbed(name, h).head2Phi(head, z)
+                  - perturbed(name, -h).head2Phi(head, z))/(2*h)
+            numpy.testing.assert_allclose(dp, fd, rtol=1e-6, atol=1e-6)
+
+        d = geo.Phi2head_gradient(Phi, z)
+        numpy.testing.assert_allclose(
+            d[0], (geo.Phi2head(Phi+h, z) - geo.Phi2head(Phi-h, z))/(2*h),
+            rtol=1e-6)
+        for name, dp in zip(names, d[1:]):
+            fd = (perturbed(name, h).Phi2head(Phi, z)
+                  - perturbed(name, -h).Phi2head(Phi, z))/(2*h)
+            numpy.testing.assert_allclose(dp, fd, rtol=1e-6, atol=1e-6)
+
+        self.assertTrue(all(numpy.isnan(geo.Phi2head_gradient(numpy.nan, z))))
+        self.assertRaises(InvalidHeadError, geo.head2Phi_gradient, 4, z)
+        self.assertRaises(InvalidDischargePotentialError,
+                          geo.Phi2head_gradient, 0, z)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,217 @@
+import unittest
+import cmath
+import numpy
+
+from ginebig.analytic_element import AnalyticElement
+from ginebig.geology import Geology
+from ginebig.image_boundary import (ImageBoundary, FiniteImageBoundary,
+                                    LineBoundary, WedgeBoundary,
+                                    StripBoundary, InvalidKindError,
+                                    InvalidGeometryError, InvalidAngleError)
+from ginebig.model import Model
+from ginebig.reference_point import ReferencePoint
+from ginebig.well import Well
+
+
+# ------------------------------------------------------------------------------
+def potential(wells, boundary, z):
+    return sum(w.complex_potential(z) for w in wells) + \
+        boundary.complex_potential(z)
+
+
+def normal_discharge(wells, boundary, z, e):
+    """Discharge normal to a line with unit direction e."""
+    W = sum(w.complex_discharge(z) for w in wells) + \
+        boundary.complex_discharge(z)
+    return (numpy.conj(W) * numpy.conj(1j*e)).real
+
+
+class TestLineBoundary(unittest.TestCase):
+    """Test the LineBoundary class."""
+
+    # --------------------------------------------------------------------------
+    def setUp(self):
+        self.wells = [Well(complex(30, 20), 100, 0.1),
+                      Well(complex(10, 60), 50, 0.1)]
+        self.t = numpy.linspace(-100, 100, 9) * complex(1, 1)
+
+    # --------------------------------------------------------------------------
+    def test_construction(self):
+        """Test constructor."""
+
+        lb = LineBoundary(0, complex(1, 1), 'head', self.wells)
+        self.assertIsInstance(lb, AnalyticElement)
+        self.assertIsInstance(lb, FiniteImageBoundary)
+        self.assertEqual(lb.kinds, ('head',))
+
+        # images() is abstract.
+        class Bare(FiniteImageBoundary):
+            kinds = ('head',)
+        self.assertRaises(TypeError, Bare, self.wells)
+
+        self.assertRaises(InvalidKindError,
+                          LineBoundary, 0, 1, 'river', self.wells)
+        self.assertRaises(InvalidGeometryError,
+                          LineBoundary, 1, 1, 'head', self.wells)
+
+    # --------------------------------------------------------------------------
+    def test_head(self):
+        """Test the discharge potential is constant along a river."""
+
+        lb = LineBoundary(0, complex(1, 1), 'head', self.wells)
+        centers, strengths = lb.images()
+        numpy.testing.assert_allclose(centers, [complex(20, 30),
+                                                complex(60, 10)])
+        numpy.testing.assert_allclose(strengths, [-100, -50])
+
+        Phi = potential(self.wells, lb, self.t).real
+        numpy.testing.assert_allclose(Phi, 0, atol=1e-12)
+        self.assertAlmostEqual(lb.abstraction(), -150)
+
+    # --------------------------------------------------------------------------
+    def test_noflow(self):
+        """Test there is no flow across a wall."""
+
+        lb = LineBoundary(0, complex(1, 1), 'noflow', self.wells)
+        e = complex(1, 1) / abs(complex(1, 1))
+        qn = normal_discharge(self.wells, lb, self.t, e)
+        numpy.testing.assert_allclose(qn, 0, atol=1e-12)
+        self.assertAlmostEqual(lb.abstraction(), 0)
+
+
+class TestWedgeBoundary(unittest.TestCase):
+    """Test the WedgeBoundary class."""
+
+    # --------------------------------------------------------------------------
+    def test_construction(self):
+        """Test constructor."""
+
+        wells = [Well(complex(30, 5), 100, 0.1)]
+        z2 = 100*cmath.exp(1j*cmath.pi/3)
+
+        wb = WedgeBoundary(0, 100, 'head', z2, 'head', wells)
+        self.assertEqual(wb.n, 3)
+        self.assertEqual(wb.images()[0].size, 5)
+
+        self.assertRaises(InvalidAngleError, WedgeBoundary,
+                          0, 100, 'head', z2, 'noflow', wells)
+        self.assertRaises(InvalidAngleError, WedgeBoundary,
+                          0, 100, 'head', complex(100, 80), 'head', wells)
+        self.assertRaises(InvalidGeometryError, WedgeBoundary,
+                          0, 0, 'head', z2, 'head', wells)
+
+    # --------------------------------------------------------------------------
+    def test_boundary_conditions(self):
+        """Test both boundary conditions hold along both rays."""
+
+        r = numpy.linspace(1, 200, 9)
+        for n in (2, 4):
+            e2 = cmath.exp(1j*cmath.pi/n)
+            for kind1, kind2 in (('head', 'noflow'), ('noflow', 'noflow')):
+                wells = [Well(complex(30, 5), 100, 0.1)]
+                wb = WedgeBoundary(0, 100, kind1, 100*e2, kind2, wells)
+                for kind, e in ((kind1, 1), (kind2, e2)):
+                    if kind == 'head':
+                        Phi = potential(wells, wb, r*e).real
+                        self.assertAlmostEqual(numpy.ptp(Phi), 0, places=10)
+                    else:
+                        qn = normal_discharge(wells, wb, r*e, e)
+                        numpy.testing.assert_allclose(qn, 0, atol=1e-12)
+
+
+class TestStripBoundary(unittest.TestCase):
+    """Test the StripBoundary class."""
+
+    # --------------------------------------------------------------------------
+    def setUp(self):
+        self.wells = [Well(complex(30, 20), 100, 0.1)]
+        self.x = numpy.linspace(-500, 500, 9)
+
+    # --------------------------------------------------------------------------
+    def test_construction(self):
+        """Test constructor."""
+
+        self.assertRaises(InvalidGeometryError, StripBoundary,
+                          0, 1, 'head', 5, 'head', self.wells)
+        self.assertRaises(InvalidKindError, StripBoundary,
+                          0, 1, 'head', 100j, 'wall', self.wells)
+
+        sb = StripBoundary(0, 1, 'head', 100j, 'noflow', self.wells)
+        self.assertIsInstance(sb, ImageBoundary)
+        self.assertNotIsInstance(sb, FiniteImageBoundary)
+        self.assertFalse(hasattr(sb, 'images'))
+
+    # --------------------------------------------------------------------------
+    def test_boundary_conditions(self):
+        """Test both boundary conditions hold along both lines."""
+
+        for kind1 in ('head', 'noflow'):
+            for kind2 in ('head', 'noflow'):
+                sb = StripBoundary(0, 1, kind1, 100j, kind2, self.wells)
+                for kind, y in ((kind1, 0), (kind2, 100)):
+                    z = self.x + 1j*y
+                    if kind == 'head':
+                        Phi = potential(self.wells, sb, z).real
+                        self.assertAlmostEqual(numpy.ptp(Phi), 0, places=10)
+                    else:
+                        qn = normal_discharge(self.wells, sb, z, 1)
+                        numpy.testing.assert_allclose(qn, 0, atol=1e-12)
+
+    # --------------------------------------------------------------------------
+    def test_truncated_series(self):
+        """Test the closed form against a long explicit image series."""
+
+        sb = StripBoundary(0, 1, 'head', 100j, 'noflow', self.wells)
+
+        # Head/no-flow images alternate in sign, so the series converges.
+        zw, Q = self.wells[0].z, self.wells[0].Q
+        centers, strengths = [], []
+        for k in range(-4000, 4001):
+            sign = (-1)**k
+            if k != 0:
+                centers.append(zw + 200j*k)
+                strengths.append(sign*Q)
+            centers.append(numpy.conj(zw) + 200j*k)
+            strengths.append(-sign*Q)
+        centers, strengths = numpy.array(centers), numpy.array(strengths)
+
+        z = numpy.array([complex(10, 50), complex(-40, 90)])
+        Phi = numpy.log(numpy.abs(z[:, None] - centers)) @ strengths
+        Phi /= 2*cmath.pi
+        dPhi_true = Phi[1] - Phi[0]
+
+        Phi = sb.complex_potential(z).real
+        self.assertAlmostEqual(Phi[1] - Phi[0], dPhi_true, places=5)
+
+        W_true = -(1/(z[:, None] - centers)) @ strengths / (2*cmath.pi)
+        numpy.testing.assert_allclose(sb.complex_discharge(z), W_true,
+                                      atol=1e-6)
+
+    # --------------------------------------------------------------------------
+    def test_far_field(self):
+        """Test the evaluation far along the strip does not overflow."""
+
+        sb = StripBoundary(0, 1, 'noflow', 100j, 'noflow', self.wells)
+        W = self.wells[0].complex_discharge(1e6 + 50j) + \
+            sb.complex_discharge(1e6 + 50j)
+        self.assertAlmostEqual(W, complex(-0.5, 0))
+
+    # --------------------------------------------------------------------------
+    def test_single_precision(self):
+        """Test the boundary in a model evaluated in single precision."""
+
+        zo = complex(480000, 5000000)
+        wells = [Well(zo + complex(30, 20), 100, 0.1)]
+        model = Model(Geology(10, 0.25, 20, 100), wells + [
+            StripBoundary(zo, zo + 1, 'head', zo + 100j, 'noflow', wells),
+            ReferencePoint(zo + 1000 + 50j, 120),
+        ])
+        model.solve()
+
+        z = zo + numpy.linspace(-200, 200, 41) + 50j
+        numpy.testing.assert_allclose(model.head(z, 'single'), model.head(z),
+                                      rtol=0, atol=1e-4)
+
+
+if __name__ == '__main__':
+    unittest.main()
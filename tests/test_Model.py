@@ -0,0 +1,151 @@
+import unittest
+import numpy
+
+from ginebig.circular_recharge import CircularRecharge
+from ginebig.geology import Geology
+from ginebig.model import Model, InvalidPrecisionError, grid
+from ginebig.reference_point import ReferencePoint
+from ginebig.uniform_flow import UniformFlow
+from ginebig.well import Well
+
+
+class TestModel(unittest.TestCase):
+    """Test the Model class."""
+
+    # --------------------------------------------------------------------------
+    def setUp(self):
+        """Build a small model at realistic world coordinates."""
+
+        self.zo = complex(480000, 5000000)
+        self.geo = Geology(10, 0.25, 20, 100)
+        self.wells = [
+            Well(self.zo + complex(100, 200), 500, 0.2),
+            Well(self.zo + complex(-300, -50), 300, 0.2),
+        ]
+        self.model = Model(self.geo, self.wells + [
+            UniformFlow(1, 0.5),
+            CircularRecharge(self.zo + 500, 0.001, 100),
+            ReferencePoint(self.zo + 3000, 125),
+        ])
+        self.model.solve()
+
+    # --------------------------------------------------------------------------
+    def test_construction(self):
+        """Test constructor."""
+
+        model = Model(self.geo)
+        self.assertEqual(model.elements, [])
+        self.assertAlmostEqual(model.constant, 0)
+
+        model.add(self.wells[0])
+        self.assertEqual(model.active_elements(), [self.wells[0]])
+
+        self.wells[0].deactivate()
+        self.assertEqual(model.active_elements(), [])
+
+    # --------------------------------------------------------------------------
+    def test_solve(self):
+        """Test that the reference head is reproduced."""
+
+        head = self.model.head(self.zo + 3000)
+        self.assertAlmostEqual(head, 125)
+
+    # --------------------------------------------------------------------------
+    def test_superposition(self):
+        """Test that the model sums the active elements."""
+
+        z = numpy.array([self.zo + complex(10, 20), self.zo + 550])
+
+        Omega_true = self.model.constant + sum(
+            e.complex_potential(z) for e in self.model.elements)
+        Omega = self.model.complex_potential(z)
+        numpy.testing.assert_allclose(Omega, Omega_true)
+
+        W_true = sum(e.complex_discharge(z) for e in self.model.elements)
+        W = self.model.complex_discharge(z)
+        numpy.testing.assert_allclose(W, W_true)
+
+        div = self.model.divergence_discharge(z)
+        numpy.testing.assert_allclose(div, [0, 0.001])
+
+    # --------------------------------------------------------------------------
+    def test_single_precision(self):
+        """Test the reduced-precision mode against the double path."""
+
+        Z = grid(self.zo.real - 1000, self.zo.real + 1000,
+                 self.zo.imag - 1000, self.zo.imag + 1000, 201, 201)
+
+        h_double = self.model.head(Z)
+        h_single = self.model.head(Z, 'single', blocksize=4096)
+        self.assertEqual(h_single.dtype, numpy.float32)
+        numpy.testing.assert_allclose(h_single, h_double, rtol=0, atol=1e-4)
+
+        W_double = self.model.complex_discharge(Z)
+        W_single = self.model.complex_discharge(Z, 'single', blocksize=4096)
+        self.assertEqual(W_single.dtype, numpy.complex64)
+        numpy.testing.assert_allclose(W_single, W_double, rtol=1e-4)
+
+        Omega_double = self.model.complex_potential(Z)
+        Omega_single = self.model.complex_potential(Z, 'single')
+        self.assertEqual(Omega_single.dtype, numpy.complex64)
+        numpy.testing.assert_allclose(Omega_single.real, Omega_double.real,
+                                      rtol=1e-6)
+
+        self.assertRaises(InvalidPrecisionError, self.model.head, Z, 'half')
+
+    # --------------------------------------------------------------------------
+    def test_head_grid(self):
+        """Test the banded grid evaluation."""
+
+        args = (self.zo.real - 500, self.zo.real + 500,
+                self.zo.imag - 200, self.zo.imag + 200, 51, 21)
+
+        heads = self.model.head_grid(*args, blocksize=200)
+        self.assertEqual(heads.shape, (21, 51))
+        numpy.testing.assert_allclose(heads, self.model.head(grid(*args)))
+
+        heads = self.model.head_grid(*args, precision='single', blocksize=200)
+        self.assertEqual(heads.dtype, numpy.float32)
+        numpy.testing.assert_allclose(heads, self.model.head(grid(*args)),
+                                      rtol=0, atol=1e-4)
+
+    # --------------------------------------------------------------------------
+    def test_head_jacobian(self):
+        """Test the parameter sensitivities against finite differences."""
+
+        # An unconfined reference head, and heads on both branches.
+        model = Model(self.geo, [
+            self.wells[0],
+            UniformFlow(1, 0.5),
+            ReferencePoint(self.zo, 118),
+        ])
+        model.solve()
+
+        e = numpy.exp(0.5j)
+        z = numpy.array([self.zo + 1000*e, self.zo - 1000*e,
+                         self.zo + complex(100, 201)])
+        heads = model.head(z)
+        self.assertTrue((heads < 120).any() and (heads > 120).any())
+
+        J = model.head_jacobian(z)
+        self.assertEqual(J.shape, (3, 3))
+        self.assertEqual(self.model.head_jacobian(z[:2, None]).shape,
+                         (2, 1, 3))
+
+        names = ['hydraulic_conductivity', 'aquifer_thickness',
+                 'base_elevation']
+        for j, name in enumerate(names):
+            h = 1e-6 * max(1, abs(getattr(self.geo, name)))
+            value = getattr(self.geo, name)
+            fd = []
+            for delta in (h, -h):
+                setattr(self.geo, name, value + delta)
+                model.solve()
+                fd.append(model.head(z))
+            setattr(self.geo, name, value)
+            numpy.testing.assert_allclose(J[:, j], (fd[0] - fd[1])/(2*h),
+                                          rtol=1e-5, atol=1e-7)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import unittest
+import cmath
+import numpy
+
+from ginebig.analytic_element import AnalyticElement
+from ginebig.circular_recharge import CircularRecharge
+from ginebig.polygon_recharge import PolygonRecharge, InvalidVerticesError
+
+
+class TestPolygonRecharge(unittest.TestCase):
+    """Test the PolygonRecharge class."""
+
+    # --------------------------------------------------------------------------
+    def test_construction(self):
+        """Test constructor."""
+        pr = PolygonRecharge([0, 1j, complex(2, 1), 2], 0.01)
+
+        self.assertIsInstance(pr, AnalyticElement)
+        self.assertIsInstance(pr, PolygonRecharge)
+
+        # Clockwise input is stored counterclockwise.
+        numpy.testing.assert_allclose(pr.vertices, [2, complex(2, 1), 1j, 0])
+        self.assertAlmostEqual(pr.N, 0.01)
+        self.assertAlmostEqual(pr.area, 2)
+
+        self.assertRaises(InvalidVerticesError, PolygonRecharge, [0, 1], 0.01)
+        self.assertRaises(InvalidVerticesError,
+                          PolygonRecharge, [0, 1, 2], 0.01)
+
+    # --------------------------------------------------------------------------
+    def test_inside(self):
+        """Test the point-in-polygon classification."""
+
+        # A non-convex "L" shaped polygon.
+        pr = PolygonRecharge([0, 2, complex(2, 1), complex(1, 1),
+                              complex(1, 2), 2j], 1)
+
+        z = numpy.array([complex(0.5, 0.5), complex(1.5, 0.5),
+                         complex(0.5, 1.5), complex(1.5, 1.5),
+                         complex(-1, 0.5), complex(3, 0.5)])
+        numpy.testing.assert_array_equal(
+            pr.inside(z), [True, True, True, False, False, False])
+
+    # --------------------------------------------------------------------------
+    def test_complex_potential(self):
+        """Test complex potential."""
+
+        # A polygon with many vertices approximates a circle.
+        zo = complex(10, 10)
+        vertices = zo + 5*numpy.exp(2j*numpy.pi*numpy.arange(2000)/2000)
+        pr = PolygonRecharge(vertices, 0.01)
+        cr = CircularRecharge(zo, 0.01, 5)
+
+        z = numpy.array([zo, complex(12, 13), complex(30, -4)])
+        Omega = PolygonRecharge.complex_potential(pr, z)
+        numpy.testing.assert_allclose(
+            Omega.real, cr.complex_potential(z).real, rtol=1e-5)
+        self.assertTrue(numpy.all(numpy.isnan(Omega.imag)))
+
+        # Compare with direct quadrature for a rectangle.
+        pr = PolygonRecharge([0, 2, complex(2, 1), 1j], 1)
+        h = 1/200
+        x, y = numpy.meshgrid(numpy.arange(h/2, 2, h), numpy.arange(h/2, 1, h))
+        zeta = x + 1j*y
+        for z in [complex(0.5, 0.5), complex(3, 2)]:
+            Phi_true = -numpy.sum(numpy.log(numpy.abs(z - zeta))) * h**2
+            Phi_true /= 2*cmath.pi
+            Phi = PolygonRecharge.complex_potential(pr, z).real
+            self.assertAlmostEqual(Phi, Phi_true, places=6)
+
+    # --------------------------------------------------------------------------
+    def test_complex_discharge(self):
+        """Test complex discharge."""
+
+        pr = PolygonRecharge([0, 2, complex(2, 1), 1j], 1)
+
+        # Compare with a centered finite difference of the potential.
+        z = numpy.array([complex(0.5, 0.5), complex(3, 2), complex(2, 0.3)])
+        d = 1e-6
+        dPhidx = (pr.complex_potential(z+d).real
+                  - pr.complex_potential(z-d).real) / (2*d)
+        dPhidy = (pr.complex_potential(z+1j*d).real
+                  - pr.complex_potential(z-1j*d).real) / (2*d)
+
+        W = PolygonRecharge.complex_discharge(pr, z)
+        numpy.testing.assert_allclose(W, -dPhidx + 1j*dPhidy, atol=1e-6)
+
+        # The vertices are removable singularities.
+        W = PolygonRecharge.complex_discharge(pr, complex(2, 1))
+        self.assertTrue(cmath.isfinite(W))
+
+    # --------------------------------------------------------------------------
+    def test_abstraction(self):
+        """Test abstraction."""
+
+        pr = PolygonRecharge([0, 2, complex(2, 1), 1j], 0.5)
+
+        ab = PolygonRecharge.abstraction(pr)
+        self.assertAlmostEqual(ab, -1)
+
+    # --------------------------------------------------------------------------
+    def test_divergence_discharge(self):
+        """Test divergence discharge."""
+
+        pr = PolygonRecharge([0, 2, complex(2, 1), 1j], 0.5)
+
+        z = numpy.array([complex(1, 0.5), complex(3, 0.5)])
+        div = PolygonRecharge.divergence_discharge(pr, z)
+        numpy.testing.assert_allclose(div, [0.5, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
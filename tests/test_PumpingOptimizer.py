@@ -0,0 +1,108 @@
+import unittest
+import numpy
+
+from ginebig.geology import Geology
+from ginebig.image_boundary import LineBoundary
+from ginebig.model import Model
+from ginebig.pumping_optimizer import (PumpingOptimizer, InvalidWellError,
+                                       InfeasibleError, UnboundedError)
+from ginebig.reference_point import ReferencePoint
+from ginebig.uniform_flow import UniformFlow
+from ginebig.well import Well
+
+
+class TestPumpingOptimizer(unittest.TestCase):
+    """Test the PumpingOptimizer class."""
+
+    # --------------------------------------------------------------------------
+    def setUp(self):
+        """Build a two-well field in an unconfined aquifer."""
+
+        self.geo = Geology(10, 0.25, 50, 100)
+        self.wells = [Well(complex(0, 0), 100, 0.2),
+                      Well(complex(200, 0), 100, 0.2)]
+        self.model = Model(self.geo, self.wells + [
+            UniformFlow(0.5, 0),
+            ReferencePoint(complex(-3000, 0), 130),
+        ])
+        self.model.solve()
+
+    # --------------------------------------------------------------------------
+    def test_construction(self):
+        """Test constructor."""
+
+        other = Well(complex(5, 5), 1, 0.1)
+        self.assertRaises(InvalidWellError, PumpingOptimizer,
+                          self.model, [other])
+
+    # --------------------------------------------------------------------------
+    def test_response_matrix(self):
+        """Test the cached response matrix against the model."""
+
+        opt = PumpingOptimizer(self.model, self.wells)
+        opt.add_head_constraint(complex(100, 50), 120)
+        opt.add_drawdown_constraint(complex(0, 0.2), 5)
+
+        A = opt.response_matrix()
+        self.assertIs(A, opt.response_matrix())
+        self.assertEqual(A.shape, (2, 2))
+
+        # The cached matrix reproduces the model heads for any discharges.
+        Q = numpy.array([300, 50])
+        heads = opt.heads(Q)
+        for well, q in zip(self.wells, Q):
+            well.Q = q
+        self.model.solve()
+        numpy.testing.assert_allclose(
+            heads, self.model.head(numpy.array(opt.points)))
+
+    # --------------------------------------------------------------------------
+    def test_boundary(self):
+        """Test a decision well that is imaged by a boundary."""
+
+        well = Well(complex(100, 0), 100, 0.2)
+        model = Model(self.geo, [
+            well,
+            LineBoundary(0, 1j, 'head', [well]),
+            ReferencePoint(complex(-3000, 0), 130),
+        ])
+        model.solve()
+
+        opt = PumpingOptimizer(model, [well])
+        opt.add_head_constraint(complex(150, 50), 120)
+        heads = opt.heads([300])
+        self.assertEqual(well.Q, 100)
+
+        well.Q = 300
+        model.solve()
+        numpy.testing.assert_allclose(
+            heads, model.head(numpy.array(opt.points)))
+
+    # --------------------------------------------------------------------------
+    def test_solve(self):
+        """Test the optimal discharges are feasible and binding."""
+
+        opt = PumpingOptimizer(self.model, self.wells, Qmax=5000)
+        opt.add_head_constraint(complex(100, 50), 120)
+        opt.add_drawdown_constraint(complex(0, 0.2), 8)
+        opt.add_drawdown_constraint(complex(200, 0.2), 8)
+
+        Q = opt.solve(apply=True)
+        self.assertTrue(numpy.all(Q >= 0))
+
+        heads = self.model.head(numpy.array(opt.points))
+        ambient = opt.ambient_heads()
+        self.assertGreaterEqual(heads[0], 120 - 1e-6)
+        self.assertTrue(numpy.all(ambient[1:] - heads[1:] <= 8 + 1e-6))
+        self.assertAlmostEqual(min(heads[0] - 120,
+                                   *(heads[1:] - ambient[1:] + 8)), 0)
+
+        opt.add_head_constraint(complex(100, 0), 1000)
+        self.assertRaises(InfeasibleError, opt.solve)
+
+        opt = PumpingOptimizer(self.model, self.wells)
+        self.assertRaises(UnboundedError, opt.solve)
+
+
+if __name__ == '__main__':
+    unittest.main()
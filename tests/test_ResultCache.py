@@ -0,0 +1,119 @@
+import os
+import tempfile
+import time
+import unittest
+import unittest.mock
+import numpy
+
+from ginebig.geology import Geology
+from ginebig.model import Model
+from ginebig.reference_point import ReferencePoint
+from ginebig.result_cache import ResultCache, InvalidCapacityError
+from ginebig.uniform_flow import UniformFlow
+from ginebig.well import Well
+
+
+# ------------------------------------------------------------------------------
+def build_model():
+    return Model(Geology(10, 0.25, 20, 100), [
+        Well(complex(300, 700), 500, 0.2),
+        UniformFlow(1, 0.5),
+        ReferencePoint(complex(5000, 0), 125),
+    ])
+
+
+class TestResultCache(unittest.TestCase):
+    """Test the ResultCache class."""
+
+    # --------------------------------------------------------------------------
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    # --------------------------------------------------------------------------
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    # --------------------------------------------------------------------------
+    def test_construction(self):
+        """Test constructor."""
+
+        self.assertRaises(InvalidCapacityError, ResultCache, self.tmp.name, 0)
+
+    # --------------------------------------------------------------------------
+    def test_key(self):
+        """Test that keys depend on the model content only."""
+
+        cache = ResultCache(self.tmp.name)
+
+        a, b = build_model(), build_model()
+        self.assertEqual(cache.key(a, 'q', 1), cache.key(b, 'q', 1))
+        self.assertNotEqual(cache.key(a, 'q', 1), cache.key(a, 'q', 2))
+
+        b.elements[0].Q = 501
+        self.assertNotEqual(cache.key(a), cache.key(b))
+
+        b = build_model()
+        b.elements[1].deactivate()
+        self.assertNotEqual(cache.key(a), cache.key(b))
+
+        b.geo.hydraulic_conductivity = 11
+        self.assertNotEqual(cache.key(a), cache.key(b))
+
+        other = ResultCache(self.tmp.name, salt='other')
+        self.assertNotEqual(cache.key(a), other.key(a))
+
+    # --------------------------------------------------------------------------
+    def test_solve_and_head_grid(self):
+        """Test that cached results are reused across model instances."""
+
+        cache = ResultCache(self.tmp.name)
+
+        model = build_model()
+        cache.solve(model)
+        heads = cache.head_grid(model, 0, 1000, 0, 500, 21, 11)
+
+        model = build_model()
+        with unittest.mock.patch.object(model, 'solve') as solve, \
+                unittest.mock.patch.object(model, 'head_grid') as head_grid:
+            cache.solve(model)
+            warm = cache.head_grid(model, 0, 1000, 0, 500, 21, 11)
+            solve.assert_not_called()
+            head_grid.assert_not_called()
+
+        self.assertIsInstance(warm, numpy.memmap)
+        numpy.testing.assert_array_equal(warm, heads)
+        self.assertAlmostEqual(model.head(complex(5000, 0)), 125)
+
+    # --------------------------------------------------------------------------
+    def test_eviction(self):
+        """Test the least recently used results are evicted first."""
+
+        item = numpy.zeros(1000)
+        cache = ResultCache(self.tmp.name, capacity=2*item.nbytes + 500)
+
+        # Set the last use times explicitly; mtimes may be coarse.
+        now = time.time()
+        cache.put('a', item)
+        os.utime(cache.path('a'), (now - 300, now - 300))
+        cache.put('b', item)
+        os.utime(cache.path('b'), (now - 200, now - 200))
+
+        # Reading 'a' makes it the most recently used.
+        self.assertIsNotNone(cache.get('a'))
+        cache.put('c', item)
+
+        self.assertIsNotNone(cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('c'))
+        self.assertLessEqual(cache.size(), cache.capacity)
+
+        cache.invalidate('a')
+        self.assertIsNone(cache.get('a'))
+        cache.invalidate('a')
+
+        cache.clear()
+        self.assertEqual(cache.size(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,163 @@
+import unittest
+import unittest.mock
+import numpy
+
+from ginebig.circular_recharge import CircularRecharge
+from ginebig.geology import Geology
+from ginebig.model import Model
+from ginebig.reference_point import ReferencePoint
+from ginebig.surrogate import FarFieldSurrogate, InvalidPartitionError
+from ginebig.uniform_flow import UniformFlow
+from ginebig.well import Well
+
+
+class TestFarFieldSurrogate(unittest.TestCase):
+    """Test the FarFieldSurrogate class."""
+
+    # --------------------------------------------------------------------------
+    def setUp(self):
+        """Build a well field and a surrogate over it."""
+
+        rng = numpy.random.default_rng(7)
+        zw = rng.uniform(0, 1000, 30) + 1j*rng.uniform(0, 1000, 30)
+
+        geo = Geology(10, 0.25, 20, 100)
+        self.wells = [Well(z, 50, 0.2) for z in zw]
+        self.model = Model(geo, self.wells + [
+            CircularRecharge(complex(500, 500), 0.001, 200),
+            UniformFlow(1, 0.5),
+            ReferencePoint(complex(5000, 0), 125),
+        ])
+        self.model.solve()
+
+        self.surrogate = FarFieldSurrogate(self.model, 0, 1000, 0, 1000,
+                                           8, 8, tol=1e-6)
+        self.z = (rng.uniform(-100, 1100, 500)
+                  + 1j*rng.uniform(-100, 1100, 500))
+
+    # --------------------------------------------------------------------------
+    def test_construction(self):
+        """Test constructor."""
+
+        self.assertRaises(InvalidPartitionError, FarFieldSurrogate,
+                          self.model, 0, 0, 0, 1000, 8, 8)
+        self.assertRaises(InvalidPartitionError, FarFieldSurrogate,
+                          self.model, 0, 1000, 0, 1000, 0, 8)
+
+    # --------------------------------------------------------------------------
+    def test_accuracy(self):
+        """Test the surrogate against the exact model."""
+
+        Phi = self.surrogate.discharge_potential(self.z)
+        W = self.surrogate.complex_discharge(self.z)
+
+        exact = self.model.complex_potential(self.z).real
+        finite = numpy.isfinite(exact)
+        numpy.testing.assert_allclose(Phi[finite], exact[finite], atol=1e-5)
+        numpy.testing.assert_allclose(
+            W[finite], self.model.complex_discharge(self.z)[finite],
+            atol=1e-6)
+        numpy.testing.assert_allclose(
+            self.surrogate.head(self.z)[finite],
+            self.model.head(self.z)[finite], atol=1e-6)
+
+        self.assertGreater(self.surrogate.nfits, 0)
+        self.assertLessEqual(self.surrogate.nfits, 64)
+
+    # --------------------------------------------------------------------------
+    def test_near_field(self):
+        """Test that a warm query only evaluates what it needs."""
+
+        self.surrogate.discharge_potential(self.z)
+        inside = self.z[(self.z.real > 0) & (self.z.real < 1000)
+                        & (self.z.imag > 0) & (self.z.imag < 1000)]
+        Phi = self.model.complex_potential(inside).real
+        W = self.model.complex_discharge(inside)
+
+        # The wells are evaluated in one pass, and W is never computed for
+        # the discharge potential.
+        fail = unittest.mock.Mock(side_effect=AssertionError)
+        with unittest.mock.patch.object(Well, 'complex_potential', fail), \
+                unittest.mock.patch.object(Well, 'complex_discharge', fail), \
+                unittest.mock.patch.object(CircularRecharge,
+                                           'complex_discharge', fail):
+            numpy.testing.assert_allclose(
+                self.surrogate.discharge_potential(inside), Phi, atol=1e-5)
+        numpy.testing.assert_allclose(
+            self.surrogate.complex_discharge(inside), W, atol=1e-6)
+
+        # At the well centers, as in Well.
+        zw = numpy.array([w.z for w in self.wells])
+        numpy.testing.assert_allclose(
+            self.surrogate.discharge_potential(zw),
+            self.model.complex_potential(zw).real, atol=1e-5)
+        self.assertTrue(numpy.isnan(self.surrogate.complex_discharge(zw))
+                        .all())
+
+    # --------------------------------------------------------------------------
+    def test_lazy_rebuild(self):
+        """Test that changes are corrected exactly, and refit lazily."""
+
+        self.surrogate.discharge_potential(self.z)
+        self.assertEqual(self.surrogate.update(), 0)
+        nfits = self.surrogate.nfits
+
+        # Queries in cells already fit do not refit.
+        self.surrogate.discharge_potential(self.z[:10])
+        self.assertEqual(self.surrogate.nfits, nfits)
+
+        # Changing one well keeps every fit, and corrects it exactly.
+        self.wells[0].Q = 80
+        self.model.solve()
+        self.assertEqual(self.surrogate.update(), 0)
+        numpy.testing.assert_allclose(
+            self.surrogate.complex_discharge(self.z),
+            self.model.complex_discharge(self.z), atol=1e-6)
+        self.assertEqual(self.surrogate.nfits, nfits)
+
+        # Deactivating a well, and moving another, are also corrected.
+        self.wells[1].deactivate()
+        self.wells[2].z += complex(300, -200)
+        self.model.solve()
+        self.assertEqual(self.surrogate.update(), 0)
+        numpy.testing.assert_allclose(
+            self.surrogate.discharge_potential(self.z),
+            self.model.complex_potential(self.z).real, atol=1e-5)
+        self.assertEqual(self.surrogate.nfits, nfits)
+
+        # Beyond DELTAS changes, the fits are discarded and refit lazily.
+        self.surrogate.DELTAS = 4
+        for well in self.wells[3:]:
+            well.Q = 60
+        self.model.solve()
+        discarded = self.surrogate.update()
+        self.assertGreater(discarded, 0)
+        numpy.testing.assert_allclose(
+            self.surrogate.discharge_potential(self.z),
+            self.model.complex_potential(self.z).real, atol=1e-5)
+        self.assertEqual(self.surrogate.nfits, nfits + discarded)
+
+    # --------------------------------------------------------------------------
+    def test_empty(self):
+        """Test a model without any active elements."""
+
+        model = Model(Geology(10, 0.25, 20, 100))
+        model.constant = 3000
+        surrogate = FarFieldSurrogate(model, 0, 1000, 0, 1000, 4, 4)
+        numpy.testing.assert_allclose(
+            surrogate.discharge_potential(self.z), 3000)
+        numpy.testing.assert_allclose(surrogate.complex_discharge(self.z), 0)
+
+        # Deactivate every element after the fits were made.
+        self.surrogate.discharge_potential(self.z)
+        for element in self.model.elements:
+            element.deactivate()
+        self.model.solve()
+        numpy.testing.assert_allclose(
+            self.surrogate.discharge_potential(self.z), 0, atol=1e-5)
+        numpy.testing.assert_allclose(
+            self.surrogate.complex_discharge(self.z), 0, atol=1e-6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+import numpy
+import scipy.special
+
+from ginebig.geology import Geology
+from ginebig.theis_well import (TheisWell, InvalidRadiusError,
+                                InvalidScheduleError)
+
+
+class TestTheisWell(unittest.TestCase):
+    """Test the TheisWell class."""
+
+    # --------------------------------------------------------------------------
+    def test_construction(self):
+        """Test constructor."""
+        tw = TheisWell(complex(1, 2), [(0, 3), (10, 0)], 0.5)
+
+        self.assertAlmostEqual(tw.z, complex(1, 2))
+        self.assertEqual(tw.schedule, [(0.0, 3.0), (10.0, 0.0)])
+        self.assertAlmostEqual(tw.r, 0.5)
+
+        self.assertRaises(InvalidRadiusError,
+                          TheisWell, complex(1, 2), [(0, 3)], -1)
+        self.assertRaises(InvalidScheduleError,
+                          TheisWell, complex(1, 2), [], 0.5)
+        self.assertRaises(InvalidScheduleError,
+                          TheisWell, complex(1, 2), [(10, 3), (0, 1)], 0.5)
+
+    # --------------------------------------------------------------------------
+    def test_discharge(self):
+        """Test the stepped pumping schedule."""
+
+        tw = TheisWell(complex(0, 0), [(0, 3), (10, 5), (20, 0)], 0.5)
+
+        Q = tw.discharge(numpy.array([-1, 0, 5, 10, 15, 25]))
+        numpy.testing.assert_allclose(Q, [0, 3, 3, 5, 5, 0])
+
+    # --------------------------------------------------------------------------
+    def test_drawdown(self):
+        """Test the drawdown against the Theis solution."""
+
+        geo = Geology(10, 0.2, 20, 0, 1e-4)
+        T = geo.transmissivity(0)
+        S = geo.storativity(0)
+
+        tw = TheisWell(complex(0, 0), [(0, 100)], 0.1)
+
+        t = numpy.array([1, 10, 100])
+        z = numpy.array([[10, 20j], [-50, complex(30, 40)]])
+        s = tw.drawdown(geo, t, z)
+        self.assertEqual(s.shape, (3, 2, 2))
+
+        u = numpy.abs(z)**2 * S / (4*T*t[:, None, None])
+        s_true = 100/(4*numpy.pi*T) * scipy.special.exp1(u)
+        numpy.testing.assert_allclose(s, s_true)
+
+        # Inside the well the drawdown at the well radius is returned.
+        self.assertAlmostEqual(tw.drawdown(geo, 1.0, 0.01),
+                               tw.drawdown(geo, 1.0, 0.1))
+
+        # No drawdown before pumping starts.
+        self.assertEqual(tw.drawdown(geo, -1.0, 10.0), 0)
+
+    # --------------------------------------------------------------------------
+    def test_superposition(self):
+        """Test that a stepped schedule is a superposition of Theis wells."""
+
+        geo = Geology(10, 0.2, 20, 0, 1e-4)
+
+        tw = TheisWell(complex(5, 5), [(0, 100), (2, 40), (4, 0)], 0.1)
+        a = TheisWell(complex(5, 5), [(0, 100)], 0.1)
+        b = TheisWell(complex(5, 5), [(2, -60)], 0.1)
+        c = TheisWell(complex(5, 5), [(4, -40)], 0.1)
+
+        t = numpy.linspace(0.5, 10, 20)
+        z = numpy.array([complex(15, 5), complex(5, 105)])
+        s_true = (a.drawdown(geo, t, z) + b.drawdown(geo, t, z)
+                  + c.drawdown(geo, t, z))
+        numpy.testing.assert_allclose(tw.drawdown(geo, t, z), s_true)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+import unittest.mock
+import numpy
+
+from ginebig.geology import Geology
+from ginebig.model import Model
+from ginebig.reference_point import ReferencePoint
+from ginebig.tile_pyramid import (TilePyramid, InvalidTileSizeError,
+                                  InvalidTileError)
+from ginebig.uniform_flow import UniformFlow
+from ginebig.well import Well
+
+
+class TestTilePyramid(unittest.TestCase):
+    """Test the TilePyramid class."""
+
+    # --------------------------------------------------------------------------
+    def setUp(self):
+        """Build a small model and an empty cache directory."""
+
+        geo = Geology(10, 0.25, 20, 100)
+        self.model = Model(geo, [
+            Well(complex(300, 700), 500, 0.2),
+            UniformFlow(1, 0.5),
+            ReferencePoint(complex(5000, 0), 125),
+        ])
+        self.model.solve()
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.pyramid = TilePyramid(self.model, 0, 0, 1024, self.tmp.name,
+                                   tilesize=17)
+
+    # --------------------------------------------------------------------------
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    # --------------------------------------------------------------------------
+    def test_construction(self):
+        """Test constructor."""
+
+        self.assertRaises(InvalidTileSizeError, TilePyramid,
+                          self.model, 0, 0, 1024, self.tmp.name, 256)
+        self.assertRaises(InvalidTileError, self.pyramid.tile, 1, 2, 0)
+        self.assertEqual(self.pyramid.extent(2, 1, 3), (256, 512, 768, 1024))
+
+    # --------------------------------------------------------------------------
+    def test_cold_and_warm(self):
+        """Test on-demand evaluation and warm reads from the cache."""
+
+        heads = self.pyramid.tile(2, 1, 3)
+        self.assertEqual(heads.shape, (17, 17))
+        numpy.testing.assert_allclose(
+            heads, self.model.head_grid(256, 512, 768, 1024, 17, 17))
+        self.assertTrue(self.pyramid.iscached(2, 1, 3))
+
+        with unittest.mock.patch.object(self.model, 'head_grid') as mock:
+            warm = self.pyramid.tile(2, 1, 3)
+            mock.assert_not_called()
+        numpy.testing.assert_array_equal(warm, heads)
+
+        self.pyramid.clear()
+        self.assertFalse(self.pyramid.iscached(2, 1, 3))
+
+    # --------------------------------------------------------------------------
+    def test_decimation(self):
+        """Test that coarse tiles are built from cached children."""
+
+        for i in (2, 3):
+            for j in (4, 5):
+                self.pyramid.tile(3, i, j)
+
+        with unittest.mock.patch.object(self.model, 'head_grid') as mock:
+            heads = self.pyramid.tile(2, 1, 2)
+            mock.assert_not_called()
+
+        numpy.testing.assert_allclose(
+            heads, self.model.head_grid(256, 512, 512, 768, 17, 17))
+        self.assertTrue(os.path.exists(self.pyramid.path(2, 1, 2)))
+
+
+if __name__ == '__main__':
+    unittest.main()
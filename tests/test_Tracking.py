@@ -0,0 +1,60 @@
+import cmath
+import unittest
+import numpy
+
+from ginebig.geology import Geology
+from ginebig.model import Model
+from ginebig.reference_point import ReferencePoint
+from ginebig.tracking import InvalidStepError, track, velocity
+from ginebig.uniform_flow import UniformFlow
+from ginebig.well import Well
+
+
+class TestTracking(unittest.TestCase):
+    """Test the particle tracking."""
+
+    # --------------------------------------------------------------------------
+    def setUp(self):
+        """Build a confined uniform flow with one downstream well."""
+
+        self.geo = Geology(10, 0.25, 20, 100)
+        self.direction = cmath.exp(0.5j)
+        self.well = Well(500*self.direction, 500, 0.2)
+        self.model = Model(self.geo, [
+            UniformFlow(1, 0.5),
+            ReferencePoint(complex(0, 0), 130),
+        ])
+        self.model.solve()
+
+    # --------------------------------------------------------------------------
+    def test_uniform(self):
+        """Test straight pathlines at the seepage velocity."""
+
+        self.assertAlmostEqual(velocity(self.model, 0), 0.2*self.direction)
+        self.assertRaises(InvalidStepError, track, self.model, 0, 0, 10)
+
+        z = numpy.array([0, 100j])
+        paths, times = track(self.model, z, 10, 5)
+        self.assertEqual(paths.shape, (2, 6))
+        numpy.testing.assert_allclose(
+            paths, z[:, None] + 10*self.direction*numpy.arange(6))
+        numpy.testing.assert_allclose(times, 50*numpy.arange(6)*[[1], [1]])
+
+        paths, times = track(self.model, 0, 10, 5, backward=True)
+        numpy.testing.assert_allclose(paths[-1], -50*self.direction)
+
+    # --------------------------------------------------------------------------
+    def test_capture(self):
+        """Test that a particle stops at the well."""
+
+        self.model.add(self.well)
+        self.model.solve()
+
+        paths, times = track(self.model, 0, 10, 80)
+        finite = numpy.isfinite(times)
+        self.assertFalse(finite.all())
+        self.assertLessEqual(abs(paths[finite][-1] - self.well.z), 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -40,6 +40,61 @@ class TestWell(unittest.TestCase):
         Omega = Well.complex_potential(we, z)
         self.assertAlmostEqual(Omega, Omega_true)
 
+    # --------------------------------------------------------------------------
+    def test_arrays(self):
+        """Test evaluation at an array of locations."""
+
+        zo = complex(10, 10)
+        we = Well(zo, 2*cmath.pi, 1)
+
+        z = numpy.array([complex(10, 20), complex(10, 10.5)])
+        Omega = Well.complex_potential(we, z)
+        numpy.testing.assert_allclose(
+            Omega, [complex(cmath.log(10), cmath.pi/2), 0])
+
+        W = Well.complex_discharge(we, z)
+        self.assertAlmostEqual(W[0], -1/complex(0, 10))
+        self.assertTrue(cmath.isnan(W[1]))
+
+        # The precision of complex64 locations is preserved.
+        z = (z - zo).astype(numpy.complex64)
+        Omega = Well.translated(we, -zo).complex_potential(z)
+        self.assertEqual(Omega.dtype, numpy.complex64)
+        self.assertAlmostEqual(complex(Omega[0]),
+                               complex(cmath.log(10), cmath.pi/2), places=6)
+
+    # --------------------------------------------------------------------------
+    def test_numpy_center(self):
+        """Test that a numpy scalar center keeps complex64 temporaries."""
+
+        zo = numpy.array([complex(10, 10)])[0]
+        we = Well(zo, 2*cmath.pi, 1)
+        self.assertIs(type(we.z), complex)
+
+        # As in the 'single' mode of the Model: a translated well evaluated
+        # at complex64 local locations.
+        z = numpy.array([complex(0, 10), complex(10, 0)],
+                        dtype=numpy.complex64)
+        local = we.translated(-zo)
+        self.assertEqual(local.complex_potential(z).dtype, numpy.complex64)
+        self.assertEqual(local.complex_discharge(z).dtype, numpy.complex64)
+
+        we.z = zo
+        self.assertEqual(we.complex_potential(z + zo.astype(numpy.complex64))
+                         .dtype, numpy.complex64)
+
+    # --------------------------------------------------------------------------
+    def test_real_locations(self):
+        """Test evaluation at real-valued locations and centers."""
+
+        well = Well(100.0, 50, 0.2)
+        Omega = well.complex_potential(50.0)
+        self.assertAlmostEqual(Omega, 50/(2*cmath.pi) * cmath.log(-50))
+
+        Omega = well.complex_potential(numpy.array([50.0, 150.0]))
+        numpy.testing.assert_allclose(
+            Omega, 50/(2*cmath.pi) * numpy.log([-50+0j, 50+0j]))
+
     # --------------------------------------------------------------------------
     def test_complex_discharge(self):
         """Test complex discharge."""
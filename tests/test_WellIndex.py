@@ -0,0 +1,141 @@
+import unittest
+import numpy
+
+from ginebig.geology import Geology
+from ginebig.model import Model
+from ginebig.uniform_flow import UniformFlow
+from ginebig.well import Well
+from ginebig.well_index import WellIndex
+
+
+class TestWellIndex(unittest.TestCase):
+    """Test the WellIndex class."""
+
+    # --------------------------------------------------------------------------
+    def setUp(self):
+        """Build a well field and points that hit some of the wells."""
+
+        rng = numpy.random.default_rng(3)
+        zw = rng.uniform(0, 100, 50) + 1j*rng.uniform(0, 100, 50)
+        rw = rng.uniform(0.5, 3, 50)
+        self.wells = [Well(z, 10, r) for z, r in zip(zw, rw)]
+        self.index = WellIndex(self.wells)
+
+        self.z = (rng.uniform(0, 100, (40, 50))
+                  + 1j*rng.uniform(0, 100, (40, 50)))
+        self.z[0, :5] = zw[:5] + 0.1
+        self.distance = numpy.abs(self.z.reshape(-1, 1) - zw) - rw
+
+    # --------------------------------------------------------------------------
+    def test_pairs(self):
+        """Test the pairs against a dense distance pass."""
+
+        for radius in (0, 5):
+            points, wells = self.index.pairs(self.z, radius)
+            expected = numpy.argwhere(self.distance < radius)
+            self.assertEqual(
+                sorted(zip(points.tolist(), wells.tolist())),
+                sorted(map(tuple, expected.tolist())))
+
+        z = numpy.array([numpy.nan, self.wells[0].z])
+        points, wells = self.index.pairs(z)
+        self.assertEqual(points.tolist(), [1])
+        self.assertEqual(wells.tolist(), [0])
+
+        empty = WellIndex([])
+        points, wells = empty.pairs(self.z, 5)
+        self.assertEqual(points.size, 0)
+        self.assertEqual(wells.size, 0)
+
+    # --------------------------------------------------------------------------
+    def test_inside_and_neighbors(self):
+        """Test the per-well and per-point lists."""
+
+        inside = self.index.inside(self.z)
+        self.assertEqual(len(inside), len(self.wells))
+        for k in range(5):
+            self.assertIn(k, inside[k])
+        for k, points in enumerate(inside):
+            numpy.testing.assert_array_equal(
+                points, numpy.flatnonzero(self.distance[:, k] < 0))
+
+        neighbors = self.index.neighbors(self.z, 5)
+        self.assertEqual(len(neighbors), self.z.size)
+        for i in (0, 7, 1999):
+            numpy.testing.assert_array_equal(
+                numpy.sort(neighbors[i]),
+                numpy.flatnonzero(self.distance[i] < 5))
+
+    # --------------------------------------------------------------------------
+    def test_well_masks(self):
+        """Test Well evaluation with the masks from the index."""
+
+        inside = self.index.inside(self.z)
+        for well, points in zip(self.wells[:5], inside):
+            numpy.testing.assert_array_equal(
+                well.complex_potential(self.z, inside=points),
+                well.complex_potential(self.z))
+            numpy.testing.assert_array_equal(
+                well.complex_discharge(self.z, inside=points),
+                well.complex_discharge(self.z))
+            numpy.testing.assert_array_equal(
+                well.divergence_discharge(self.z, inside=points),
+                well.divergence_discharge(self.z))
+
+    # --------------------------------------------------------------------------
+    def test_integer_locations(self):
+        """Test masked Well evaluation at integer locations."""
+
+        well = Well(0, 1, 1)
+        self.assertAlmostEqual(well.complex_discharge(-5), 1/(10*numpy.pi))
+        self.assertTrue(numpy.isnan(well.complex_discharge(0)))
+
+        z = numpy.array([-5, 0, 3])
+        inside = WellIndex([well]).inside(z)[0]
+        numpy.testing.assert_array_equal(inside, [1])
+        W = well.complex_discharge(z, inside=inside)
+        self.assertTrue(numpy.isnan(W[1]))
+        numpy.testing.assert_allclose(W[[0, 2]], [1/(10*numpy.pi),
+                                                  -1/(6*numpy.pi)])
+        numpy.testing.assert_array_equal(
+            numpy.isnan(well.divergence_discharge(z, inside=inside)),
+            [False, True, False])
+
+    # --------------------------------------------------------------------------
+    def test_model(self):
+        """Test that the model reuses its index until a well moves."""
+
+        model = Model(Geology(10, 0.25, 20, 100),
+                      self.wells + [UniformFlow(1, 0.5)])
+        index = model.well_index()
+        W = model.complex_discharge(self.z)
+        self.assertIs(model.well_index(), index)
+        self.assertTrue(numpy.isnan(W[0, :5]).all())
+
+        self.wells[0].Q = 20
+        self.assertIs(model.well_index(), index)
+
+        self.wells[0].z += 50
+        self.assertIsNot(model.well_index(), index)
+        self.assertTrue(numpy.isfinite(model.complex_discharge(self.z[0, 0])))
+
+    # --------------------------------------------------------------------------
+    def test_model_threshold(self):
+        """Test that the model only uses its index above INDEX_WELLS."""
+
+        model = Model(Geology(10, 0.25, 20, 100),
+                      self.wells + [UniformFlow(1, 0.5)])
+        self.assertLess(len(self.wells), model.INDEX_WELLS)
+        Omega = model.complex_potential(self.z)
+        W = model.complex_discharge(self.z)
+        self.assertIsNone(model._index)
+
+        model.INDEX_WELLS = 1
+        numpy.testing.assert_array_equal(model.complex_potential(self.z),
+                                         Omega)
+        numpy.testing.assert_array_equal(model.complex_discharge(self.z), W)
+        self.assertIsNotNone(model._index)
+
+
+if __name__ == '__main__':
+    unittest.main()